@@ -0,0 +1,27 @@
+"""
+Compilación de las extensiones opcionales de Cython.
+
+Uso: python setup.py build_ext --inplace
+
+El proyecto funciona sin compilar nada; si la extensión existe, kruskal.py
+la usa en lugar de la implementación de Union-Find en Python.
+"""
+
+import sys
+
+from setuptools import setup, Extension
+from Cython.Build import cythonize
+
+if sys.platform == 'win32':
+    opciones = ['/O2']
+else:
+    opciones = ['-O3', '-march=native']
+
+extensiones = [
+    Extension('src._unionfind', ['src/_unionfind.pyx'], extra_compile_args=opciones),
+]
+
+setup(
+    name='proyecto-algoritmos-avanzados',
+    ext_modules=cythonize(extensiones),
+)
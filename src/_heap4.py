@@ -0,0 +1,86 @@
+"""
+Heap 4-ario de mínimos sobre arrays de NumPy, compilado con Numba.
+
+El heap se guarda en dos arrays paralelos: heap_w con las claves (pesos) y
+heap_v con los nodos. Cada nodo i tiene como hijos 4*i+1..4*i+4 y como padre
+(i-1) >> 2, por lo que el árbol es la mitad de profundo que un heap binario
+y los hermanos comparten línea de caché. El tamaño lo lleva el llamador:
+push4 y pop4 reciben el tamaño actual y devuelven el nuevo.
+
+Este módulo requiere Numba.
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def push4(heap_w: np.ndarray, heap_v: np.ndarray, size: int, w: int, v: int) -> int:
+    """
+    Inserta el par (w, v) en el heap.
+    
+    Args:
+        heap_w: Array de claves del heap
+        heap_v: Array de nodos del heap
+        size: Número de elementos actuales
+        w: Clave a insertar
+        v: Nodo a insertar
+    
+    Returns:
+        Nuevo tamaño del heap
+    
+    Complejidad: O(log₄ n)
+    """
+    i = size
+    while i > 0:
+        padre = (i - 1) >> 2
+        if heap_w[padre] <= w:
+            break
+        heap_w[i] = heap_w[padre]
+        heap_v[i] = heap_v[padre]
+        i = padre
+    heap_w[i] = w
+    heap_v[i] = v
+    return size + 1
+
+
+@njit(cache=True)
+def pop4(heap_w: np.ndarray, heap_v: np.ndarray, size: int):
+    """
+    Extrae el par (w, v) de menor clave.
+    
+    Args:
+        heap_w: Array de claves del heap
+        heap_v: Array de nodos del heap
+        size: Número de elementos actuales (mayor que 0)
+    
+    Returns:
+        Tupla con (clave, nodo) del mínimo y el nuevo tamaño del heap
+    
+    Complejidad: O(4 log₄ n)
+    """
+    w = heap_w[0]
+    v = heap_v[0]
+    
+    # Hundir el último elemento desde la raíz
+    size -= 1
+    ultimo_w = heap_w[size]
+    ultimo_v = heap_v[size]
+    i = 0
+    while True:
+        primero = 4 * i + 1
+        if primero >= size:
+            break
+        menor = primero
+        for hijo in range(primero + 1, min(primero + 4, size)):
+            if heap_w[hijo] < heap_w[menor]:
+                menor = hijo
+        if heap_w[menor] >= ultimo_w:
+            break
+        heap_w[i] = heap_w[menor]
+        heap_v[i] = heap_v[menor]
+        i = menor
+    heap_w[i] = ultimo_w
+    heap_v[i] = ultimo_v
+    
+    return w, v, size
@@ -0,0 +1,164 @@
+"""
+Kernel de Kruskal compilado con Numba.
+
+Contiene el bucle completo de Union-Find sobre arrays de ids ya ordenados por
+peso y un filtrado previo en paralelo para lotes grandes. Este módulo requiere
+Numba; kruskal.py lo importa de forma opcional y usa la implementación en
+Python puro si no está disponible.
+
+Complejidad: O(E * α(V)) sin contar el ordenamiento
+"""
+
+import numpy as np
+from numba import get_num_threads, njit, prange
+
+# Aristas mínimas de un lote para que el filtrado en paralelo compense
+_UMBRAL_PARALELO = 100_000
+
+
+@njit(cache=True)
+def _encontrar(padre: np.ndarray, nodo: int) -> int:
+    """
+    Encuentra la raíz de un nodo con compresión de ruta iterativa en dos pasadas.
+    
+    Complejidad: O(α(n)) amortizado
+    """
+    raiz = nodo
+    while padre[raiz] != raiz:
+        raiz = padre[raiz]
+    while padre[nodo] != raiz:
+        siguiente = padre[nodo]
+        padre[nodo] = raiz
+        nodo = siguiente
+    return raiz
+
+
+@njit(cache=True)
+def _unir_raices(padre: np.ndarray, rango: np.ndarray, raiz1: int, raiz2: int):
+    """
+    Une dos raíces distintas por rango.
+    
+    Complejidad: O(1)
+    """
+    # Unión por rango sin saltos: dos selecciones (movimientos condicionales)
+    # y un incremento en lugar de las tres ramas <, >, ==
+    diferencia = rango[raiz1] - rango[raiz2]
+    padre[raiz1] = raiz2 if diferencia < 0 else raiz1
+    padre[raiz2] = raiz1 if diferencia >= 0 else raiz2
+    rango[raiz1] += diferencia == 0
+
+
+@njit(parallel=True, nogil=True, cache=True)
+def _filtrar_bloques(u: np.ndarray, v: np.ndarray, orden: np.ndarray, n: int,
+                     bloques: int) -> np.ndarray:
+    """
+    Descarta en paralelo las aristas que forman ciclo dentro de su propio bloque.
+    
+    Las aristas ordenadas se parten en bloques contiguos y cada hilo corre
+    Kruskal con un Union-Find privado sobre su bloque. Una arista que cierra
+    un ciclo con aristas anteriores de su bloque también lo cerraría en el
+    recorrido completo, así que quitarla no cambia el MST. Sobreviven a lo
+    sumo n-1 aristas por bloque.
+    
+    Args:
+        u: Id del primer extremo de cada arista
+        v: Id del segundo extremo de cada arista
+        orden: Índices de las aristas ordenadas por peso
+        n: Número de nodos
+        bloques: Número de bloques (uno por hilo)
+    
+    Returns:
+        Subconjunto de orden, en el mismo orden, con las aristas candidatas
+    
+    Complejidad: O(E/T * α(V) + V) por hilo, con T bloques
+    """
+    m = orden.shape[0]
+    conservar = np.zeros(m, dtype=np.bool_)
+    tam = (m + bloques - 1) // bloques
+    
+    for t in prange(bloques):
+        padre = np.empty(n, dtype=np.int32)
+        for i in range(n):
+            padre[i] = i
+        rango = np.zeros(n, dtype=np.int8)
+        
+        for k in range(t * tam, min((t + 1) * tam, m)):
+            e = orden[k]
+            raiz1 = _encontrar(padre, u[e])
+            raiz2 = _encontrar(padre, v[e])
+            if raiz1 != raiz2:
+                _unir_raices(padre, rango, raiz1, raiz2)
+                conservar[k] = True
+    
+    return orden[conservar]
+
+
+def _filtrar_paralelo(u: np.ndarray, v: np.ndarray, orden: np.ndarray, n: int) -> np.ndarray:
+    """
+    Aplica _filtrar_bloques cuando el lote es lo bastante grande.
+    
+    Cada bloque necesita un Union-Find de n nodos, así que solo se usan
+    bloques con bastantes más aristas que nodos.
+    
+    Args:
+        u: Id del primer extremo de cada arista
+        v: Id del segundo extremo de cada arista
+        orden: Índices de las aristas ordenadas por peso
+        n: Número de nodos
+    
+    Returns:
+        Índices de las aristas candidatas, en orden de peso
+    
+    Complejidad: O(E * α(V) / T + T * V)
+    """
+    bloques = min(get_num_threads(), len(orden) // (4 * n))
+    if len(orden) < _UMBRAL_PARALELO or bloques < 2:
+        return orden
+    return _filtrar_bloques(u, v, orden, n, bloques)
+
+
+@njit(cache=True)
+def _kruskal_core(u: np.ndarray, v: np.ndarray, w: np.ndarray, orden: np.ndarray,
+                  padre: np.ndarray, rango: np.ndarray, faltan: int):
+    """
+    Recorre las aristas en orden de peso y selecciona las del MST.
+    
+    Puede llamarse varias veces sobre lotes consecutivos de aristas: padre y
+    rango conservan el estado de Union-Find entre llamadas.
+    
+    Args:
+        u: Id del primer extremo de cada arista
+        v: Id del segundo extremo de cada arista
+        w: Peso de cada arista
+        orden: Índices de las aristas del lote, ordenadas por peso
+        padre: Array de padres de Union-Find (inicialmente 0..n-1)
+        rango: Array de rangos de Union-Find (inicialmente ceros)
+        faltan: Aristas que faltan para completar el MST (V-1 en la primera llamada)
+    
+    Returns:
+        Tupla con (número de aristas seleccionadas, peso total, índices de las aristas seleccionadas)
+    
+    Complejidad: O(E * α(V))
+    """
+    mst = np.empty(max(faltan, 0), dtype=np.int64)
+    cantidad = 0
+    peso_total = np.int64(0)  # Los pesos pueden venir en int16/int32: se acumula en int64
+    
+    for k in range(orden.shape[0]):
+        # Si ya tenemos V-1 aristas, terminamos
+        if cantidad == faltan:
+            break
+        
+        e = orden[k]
+        raiz1 = _encontrar(padre, u[e])
+        raiz2 = _encontrar(padre, v[e])
+        if raiz1 == raiz2:
+            continue  # Formaría ciclo
+        
+        _unir_raices(padre, rango, raiz1, raiz2)
+        
+        mst[cantidad] = e
+        cantidad += 1
+        peso_total += w[e]
+    
+    return cantidad, peso_total, mst
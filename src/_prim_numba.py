@@ -0,0 +1,73 @@
+"""
+Kernel de Prim compilado con Numba.
+
+Recorre el grafo en formato CSR con un heap 4-ario de arrays (ver _heap4.py).
+El heap guarda solo (peso, nodo); la arista de llegada de cada nodo se
+registra aparte en pred al relajar. Este módulo requiere Numba; prim.py lo
+importa de forma opcional y usa heapq si no está disponible.
+
+Complejidad: O(E log V)
+"""
+
+import numpy as np
+from numba import njit
+
+from src._heap4 import push4, pop4
+
+
+@njit(cache=True)
+def _prim_core(indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray,
+               inicio: int, V: int):
+    """
+    Calcula el MST de la componente de inicio.
+    
+    Args:
+        indptr: Punteros de inicio de cada fila CSR
+        indices: Destinos de las aristas CSR
+        weights: Pesos de las aristas CSR
+        inicio: Id del nodo inicial
+        V: Número de nodos
+    
+    Returns:
+        Tupla con (número de nodos agregados, ids en orden de llegada, pred, mejor).
+        Cada nodo agregado u entra al MST por la arista (pred[u], u, mejor[u]).
+    
+    Complejidad: O(E log V)
+    """
+    mejor = np.full(V, np.iinfo(np.int64).max, dtype=np.int64)
+    pred = np.full(V, -1, dtype=np.int32)
+    visitado = np.zeros(V, dtype=np.bool_)
+    orden = np.empty(V, dtype=np.int32)
+    
+    heap_w = np.empty(indices.shape[0] + 1, dtype=np.int64)
+    heap_v = np.empty(indices.shape[0] + 1, dtype=np.int32)
+    size = 0
+    
+    cantidad = 0
+    u = inicio
+    visitado[u] = True
+    # Con V-1 aristas el MST está completo: se termina sin vaciar el heap
+    while cantidad < V - 1:
+        # Relajar las aristas del nodo recién agregado
+        for k in range(indptr[u], indptr[u + 1]):
+            vecino = indices[k]
+            if not visitado[vecino] and weights[k] < mejor[vecino]:
+                mejor[vecino] = weights[k]
+                pred[vecino] = u
+                size = push4(heap_w, heap_v, size, weights[k], vecino)
+        
+        # Extraer el siguiente nodo no visitado
+        u = -1
+        while size > 0:
+            _, candidato, size = pop4(heap_w, heap_v, size)
+            if not visitado[candidato]:
+                u = candidato
+                break
+        if u == -1:
+            break
+        
+        visitado[u] = True
+        orden[cantidad] = u
+        cantidad += 1
+    
+    return cantidad, orden, pred, mejor
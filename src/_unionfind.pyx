@@ -0,0 +1,95 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Union-Find (Disjoint Set Union) como tipo de extensión de Cython.
+
+Misma interfaz que kruskal.UnionFind, con padre y rango en arrays de C
+reservados con PyMem_Malloc. Se compila con: python setup.py build_ext --inplace
+"""
+
+from cpython.mem cimport PyMem_Malloc, PyMem_Free
+
+
+cdef class UnionFindC:
+    """
+    Estructura Union-Find con compresión de ruta y unión por rango.
+    
+    Los nodos se identifican con enteros 0..n-1.
+    """
+    
+    cdef int *padre
+    cdef signed char *rango
+    cdef readonly int n
+    
+    def __cinit__(self, int n):
+        """
+        Inicializa la estructura Union-Find.
+        
+        Args:
+            n: Número de nodos
+        
+        Complejidad: O(n)
+        """
+        cdef int i
+        self.n = n
+        self.padre = <int *> PyMem_Malloc(max(n, 1) * sizeof(int))
+        self.rango = <signed char *> PyMem_Malloc(max(n, 1) * sizeof(signed char))
+        if self.padre == NULL or self.rango == NULL:
+            raise MemoryError()
+        for i in range(n):
+            self.padre[i] = i
+            self.rango[i] = 0
+    
+    def __dealloc__(self):
+        PyMem_Free(self.padre)
+        PyMem_Free(self.rango)
+    
+    cpdef int encontrar(self, int nodo):
+        """
+        Encuentra el representante del conjunto que contiene al nodo.
+        
+        Args:
+            nodo: Id del nodo a buscar
+        
+        Returns:
+            Id del representante del conjunto
+        
+        Complejidad: O(α(n)) amortizado
+        """
+        cdef int raiz = nodo
+        cdef int siguiente
+        while self.padre[raiz] != raiz:
+            raiz = self.padre[raiz]
+        while self.padre[nodo] != raiz:
+            siguiente = self.padre[nodo]
+            self.padre[nodo] = raiz
+            nodo = siguiente
+        return raiz
+    
+    cpdef bint unir(self, int nodo1, int nodo2):
+        """
+        Une los conjuntos que contienen a nodo1 y nodo2.
+        
+        Args:
+            nodo1: Id del primer nodo
+            nodo2: Id del segundo nodo
+        
+        Returns:
+            True si se unieron (estaban en conjuntos diferentes), False si ya estaban unidos
+        
+        Complejidad: O(α(n)) amortizado
+        """
+        cdef int raiz1 = self.encontrar(nodo1)
+        cdef int raiz2 = self.encontrar(nodo2)
+        cdef int diferencia
+        
+        if raiz1 == raiz2:
+            return False  # Ya están en el mismo conjunto (formarían ciclo)
+        
+        # Unión por rango sin saltos: dos selecciones (movimientos condicionales)
+        # y un incremento en lugar de las tres ramas <, >, ==
+        diferencia = self.rango[raiz1] - self.rango[raiz2]
+        self.padre[raiz1] = raiz2 if diferencia < 0 else raiz1
+        self.padre[raiz2] = raiz1 if diferencia >= 0 else raiz2
+        self.rango[raiz1] += diferencia == 0
+        
+        return True
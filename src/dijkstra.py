@@ -7,76 +7,535 @@ a todos los demás nodos en un grafo con pesos no negativos.
 Complejidad: O((V + E) log V) con heap binario
 """
 
+import functools
 import heapq
-from typing import List, Tuple, Dict, Set
-from src.graph_utils import leer_grafo_csv, crear_grafo_networkx, visualizar_grafo
+import os
+import numpy as np
+from typing import List, Tuple, Dict, Optional
+from src.graph_utils import (GrafoCSR, leer_edge_arrays_cacheado, construir_csr, csr_desde_edge_arrays,
+                             crear_grafo_networkx, visualizar_grafo, calcular_clave)
 
+try:
+    from numba import njit
+    NUMBA_DISPONIBLE = True
+except ImportError:  # Numba es opcional: sin él los kernels corren como Python puro
+    NUMBA_DISPONIBLE = False
 
-def dijkstra(aristas: List[Tuple[str, str, int]], nodo_origen: str) -> Tuple[Dict[str, int], Dict[str, str]]:
+    def njit(**kwargs):
+        return lambda f: f
+
+# Por debajo de este número de nodos delta-stepping no compensa frente a Dijkstra
+_UMBRAL_DELTA_STEPPING = 1000
+
+# Grado medio (entradas CSR por nodo) a partir del cual, sin Numba, conviene
+# relajar cada fila con NumPy en lugar de recorrerla como lista de Python
+_UMBRAL_GRADO_VECTORIZADO = 128
+
+# Distancia de los nodos no alcanzables. Se deja margen para que sumar un peso
+# a una distancia finita nunca desborde int64.
+INF = int(np.iinfo(np.int64).max // 2)
+
+
+@njit(cache=True)
+def _sift_up(heap_dist: np.ndarray, heap_node: np.ndarray, i: int):
     """
-    Implementa el algoritmo de Dijkstra para encontrar caminos más cortos.
+    Sube el elemento i del heap binario mínimo hasta su posición.
+    
+    Complejidad: O(log n)
+    """
+    d = heap_dist[i]
+    n = heap_node[i]
+    while i > 0:
+        padre = (i - 1) >> 1
+        if heap_dist[padre] <= d:
+            break
+        heap_dist[i] = heap_dist[padre]
+        heap_node[i] = heap_node[padre]
+        i = padre
+    heap_dist[i] = d
+    heap_node[i] = n
+
+
+@njit(cache=True)
+def _sift_down(heap_dist: np.ndarray, heap_node: np.ndarray, i: int, size: int):
+    """
+    Baja el elemento i del heap binario mínimo hasta su posición.
+    
+    Complejidad: O(log n)
+    """
+    d = heap_dist[i]
+    n = heap_node[i]
+    while True:
+        hijo = 2 * i + 1
+        if hijo >= size:
+            break
+        if hijo + 1 < size and heap_dist[hijo + 1] < heap_dist[hijo]:
+            hijo += 1
+        if heap_dist[hijo] >= d:
+            break
+        heap_dist[i] = heap_dist[hijo]
+        heap_node[i] = heap_node[hijo]
+        i = hijo
+    heap_dist[i] = d
+    heap_node[i] = n
+
+
+@njit(cache=True)
+def _dijkstra_csr(indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray,
+                  src: int, V: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Kernel de Dijkstra sobre la representación CSR.
+    
+    Usa un heap binario mínimo implementado con dos arrays paralelos
+    (distancia, nodo), ya que Numba no acelera heapq. Las entradas obsoletas
+    del heap se descartan al extraerlas y un array de visitados impide volver
+    a relajar un nodo ya fijado: con una arista negativa (que en un grafo no
+    dirigido forma un ciclo negativo) el recorrido igual termina.
     
     Args:
-        aristas: Lista de tuplas (nodo1, nodo2, peso)
+        indptr: Inicio del rango de vecinos de cada nodo (tamaño V+1)
+        indices: Ids de los vecinos
+        weights: Pesos de las aristas
+        src: Id del nodo origen
+        V: Número de nodos
+    
+    Returns:
+        Tupla con (distancias, predecesores) indexadas por id
+        (INF si no es alcanzable, -1 sin predecesor)
+    
+    Complejidad: O((V + E) log V)
+    """
+    dist = np.full(V, INF, dtype=np.int64)
+    pred = np.empty(V, dtype=np.int32)
+    pred[:] = -1
+    dist[src] = 0
+    visitados = np.zeros(V, dtype=np.bool_)
+    
+    # Cada arista dirigida se relaja una sola vez (al visitar su origen) y
+    # produce como máximo una inserción, más el origen
+    capacidad = indices.shape[0] + 1
+    heap_dist = np.empty(capacidad, dtype=np.int64)
+    heap_node = np.empty(capacidad, dtype=np.int32)
+    heap_dist[0] = 0
+    heap_node[0] = src
+    size = 1
+    
+    while size > 0:
+        d = heap_dist[0]
+        u = heap_node[0]
+        size -= 1
+        if size > 0:
+            heap_dist[0] = heap_dist[size]
+            heap_node[0] = heap_node[size]
+            _sift_down(heap_dist, heap_node, 0, size)
+        
+        # Eliminación perezosa: una entrada obsoleta tiene distancia mayor
+        # a la ya fijada para el nodo
+        if d != dist[u] or visitados[u]:
+            continue
+        visitados[u] = True
+        
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            nueva_distancia = d + weights[k]
+            if not visitados[v] and nueva_distancia < dist[v]:
+                dist[v] = nueva_distancia
+                pred[v] = u
+                heap_dist[size] = nueva_distancia
+                heap_node[size] = v
+                _sift_up(heap_dist, heap_node, size)
+                size += 1
+    
+    return dist, pred
+
+
+def _dijkstra_listas(indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray,
+                     src: int, V: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Variante de _dijkstra_csr para entornos sin Numba, con heapq sobre listas.
+    
+    Recorrer listas de Python evita crear un escalar de NumPy por vecino, como
+    en el camino sin Numba de Prim. Es la opción más rápida en grafos dispersos.
+    
+    Args:
+        indptr: Inicio del rango de vecinos de cada nodo (tamaño V+1)
+        indices: Ids de los vecinos
+        weights: Pesos de las aristas
+        src: Id del nodo origen
+        V: Número de nodos
+    
+    Returns:
+        Tupla con (distancias, predecesores) indexadas por id
+        (INF si no es alcanzable, -1 sin predecesor)
+    
+    Complejidad: O((V + E) log V)
+    """
+    indptr = indptr.tolist()
+    indices = indices.tolist()
+    weights = weights.tolist()
+    
+    dist: List[int] = [INF] * V
+    pred: List[int] = [-1] * V
+    visitados: List[bool] = [False] * V
+    dist[src] = 0
+    heap = [(0, src)]
+    
+    # Enlaces locales: evitan LOAD_GLOBAL + LOAD_ATTR en cada iteración
+    push, pop = heapq.heappush, heapq.heappop
+    
+    while heap:
+        d, u = pop(heap)
+        
+        # La primera extracción de cada nodo trae su distancia final; las
+        # siguientes son entradas obsoletas
+        if visitados[u]:
+            continue
+        visitados[u] = True
+        
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            nueva_distancia = d + weights[k]
+            if nueva_distancia < dist[v] and not visitados[v]:
+                dist[v] = nueva_distancia
+                pred[v] = u
+                push(heap, (nueva_distancia, v))
+    
+    return np.array(dist, dtype=np.int64), np.array(pred, dtype=np.int32)
+
+
+def _dijkstra_numpy(indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray,
+                    src: int, V: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Variante de _dijkstra_csr para entornos sin Numba y grafos densos.
+    
+    La relajación de los vecinos de cada nodo se hace con operaciones
+    vectorizadas de NumPy sobre su rango CSR, de modo que el bucle en Python
+    solo recorre las inserciones que realmente mejoran una distancia. Como en
+    _dijkstra_csr, los nodos visitados no se vuelven a relajar. Cada nodo
+    extraído paga varias llamadas a NumPy, por eso solo compensa frente a
+    _dijkstra_listas cuando las filas son largas (ver _UMBRAL_GRADO_VECTORIZADO).
+    
+    Args:
+        indptr: Inicio del rango de vecinos de cada nodo (tamaño V+1)
+        indices: Ids de los vecinos
+        weights: Pesos de las aristas
+        src: Id del nodo origen
+        V: Número de nodos
+    
+    Returns:
+        Tupla con (distancias, predecesores) indexadas por id
+        (INF si no es alcanzable, -1 sin predecesor)
+    
+    Complejidad: O((V + E) log V)
+    """
+    dist = np.full(V, INF, dtype=np.int64)
+    pred = np.full(V, -1, dtype=np.int32)
+    dist[src] = 0
+    visitados = np.zeros(V, dtype=np.bool_)
+    heap = [(0, src)]
+    
+    # Enlaces locales: evitan LOAD_GLOBAL + LOAD_ATTR en cada iteración
+    push, pop = heapq.heappush, heapq.heappop
+    minimo_en = np.minimum.at
+    sumar = np.add
+    int64 = np.int64
+    
+    while heap:
+        d, u = pop(heap)
+        
+        # Descartar entradas obsoletas y nodos ya fijados
+        if d != dist[u] or visitados[u]:
+            continue
+        visitados[u] = True
+        
+        s, e = indptr[u], indptr[u + 1]
+        vecinos = indices[s:e]
+        # Los pesos pueden venir en int16/int32: la suma se fuerza a int64 porque
+        # con NumPy 1.x un escalar más un array conserva el tipo del array
+        candidatos = sumar(weights[s:e], d, dtype=int64)
+        mejores = (candidatos < dist[vecinos]) & ~visitados[vecinos]
+        if not mejores.any():
+            continue
+        
+        actualizados = vecinos[mejores]
+        nuevas = candidatos[mejores]
+        # minimum.at resuelve correctamente las aristas paralelas repetidas
+        minimo_en(dist, actualizados, nuevas)
+        finales = nuevas == dist[actualizados]
+        pred[actualizados[finales]] = u
+        for v, nueva_distancia in zip(actualizados[finales].tolist(), nuevas[finales].tolist()):
+            push(heap, (nueva_distancia, v))
+    
+    return dist, pred
+
+
+def _a_etiquetas(label_of: List[str], distancias: np.ndarray,
+                 predecesores: np.ndarray) -> Tuple[Dict[str, int], Dict[str, str]]:
+    """
+    Traduce los arrays de distancias y predecesores indexados por id a diccionarios por etiqueta.
+    
+    Complejidad: O(V)
+    """
+    distancias_lista = distancias.tolist()
+    resultado_distancias: Dict[str, int] = {
+        label_of[i]: distancias_lista[i] for i in range(len(label_of))
+    }
+    resultado_predecesores: Dict[str, str] = {
+        label_of[i]: label_of[p]
+        for i, p in enumerate(predecesores.tolist()) if p >= 0
+    }
+    return resultado_distancias, resultado_predecesores
+
+
+@functools.lru_cache(maxsize=8)
+def _load_csr(archivo_csv: str, mtime: float) -> Tuple[Dict[str, int], List[str],
+                                                      np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Construye (una vez por versión del archivo) la representación CSR de un grafo.
+    
+    Las consultas siguientes sobre el mismo archivo sin modificar reutilizan el
+    resultado y pasan directamente al kernel. Los arrays se marcan como de solo
+    lectura porque se comparten entre llamadas.
+    
+    Args:
+        archivo_csv: Ruta al archivo CSV con el grafo
+        mtime: Fecha de modificación del archivo (parte de la clave de caché)
+    
+    Returns:
+        Tupla con (id_of, label_of, indptr, indices, weights)
+    
+    Complejidad: O(V + E log E) la primera vez, O(1) en las siguientes
+    """
+    label_of, indptr, indices, weights = csr_desde_edge_arrays(leer_edge_arrays_cacheado(archivo_csv))
+    for array in (indptr, indices, weights):
+        array.flags.writeable = False
+    id_of = {nodo: i for i, nodo in enumerate(label_of)}
+    return id_of, label_of, indptr, indices, weights
+
+
+def dijkstra_csr(csr: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray], nodo_origen: str,
+                 id_of: Optional[Dict[str, int]] = None) -> Tuple[Dict[str, int], Dict[str, str]]:
+    """
+    Ejecuta Dijkstra sobre un grafo ya cargado en representación CSR.
+    
+    El bucle principal se ejecuta en el kernel _dijkstra_csr compilado con
+    Numba. Si Numba no está instalado se usa _dijkstra_listas, o _dijkstra_numpy
+    cuando el grado medio del grafo es alto.
+    
+    Args:
+        csr: GrafoCSR o tupla (label_of, indptr, indices, weights), ver leer_grafo_csv_arrays
         nodo_origen: Nodo desde donde calcular las distancias
+        id_of: Mapa nodo -> id (se calcula a partir de nodos si no se indica)
     
     Returns:
-        Tupla con (distancias desde origen, predecesores para reconstruir rutas)
+        Tupla con (distancias desde origen, predecesores para reconstruir rutas);
+        los nodos no alcanzables tienen distancia INF
     
     Complejidad: O((V + E) log V) con heap binario
     """
-    # Construir lista de adyacencia
-    # Complejidad: O(E)
-    grafo: Dict[str, List[Tuple[str, int]]] = {}
-    for nodo1, nodo2, peso in aristas:
-        if nodo1 not in grafo:
-            grafo[nodo1] = []
-        if nodo2 not in grafo:
-            grafo[nodo2] = []
-        grafo[nodo1].append((nodo2, peso))
-        grafo[nodo2].append((nodo1, peso))
+    label_of, indptr, indices, weights = csr
+    if id_of is None:
+        id_of = {nodo: i for i, nodo in enumerate(label_of)}
     
     # Verificar que el nodo origen existe
-    if nodo_origen not in grafo:
+    if nodo_origen not in id_of:
         print(f"✗ Error: El nodo '{nodo_origen}' no existe en el grafo")
         return {}, {}
     
-    # Inicializar distancias y predecesores
-    distancias: Dict[str, float] = {nodo: float('inf') for nodo in grafo}
-    distancias[nodo_origen] = 0
-    predecesores: Dict[str, str] = {}
-    visitados: Set[str] = set()
+    # Ejecutar el kernel sobre arrays de ids
+    # Complejidad: O((V + E) log V)
+    if NUMBA_DISPONIBLE:
+        kernel = _dijkstra_csr
+    elif len(indices) >= _UMBRAL_GRADO_VECTORIZADO * len(label_of):
+        kernel = _dijkstra_numpy
+    else:
+        kernel = _dijkstra_listas
+    distancias, predecesores = kernel(indptr, indices, weights,
+                                      id_of[nodo_origen], len(label_of))
     
-    # Heap de prioridad: (distancia, nodo)
-    # Complejidad de heappush/heappop: O(log V)
-    heap = [(0, nodo_origen)]
+    # Traducir ids a etiquetas de nodo
+    # Complejidad: O(V)
+    return _a_etiquetas(label_of, distancias, predecesores)
+
+
+def dijkstra(aristas: List[Tuple[str, str, int]], nodo_origen: str) -> Tuple[Dict[str, int], Dict[str, str]]:
+    """
+    Implementa el algoritmo de Dijkstra para encontrar caminos más cortos.
     
-    # Procesar nodos
-    # Complejidad total: O((V + E) log V)
-    while heap:
-        distancia_actual, nodo_actual = heapq.heappop(heap)
-        
-        # Si ya visitamos este nodo, continuar
-        if nodo_actual in visitados:
-            continue
+    El grafo se convierte a CSR con nodos codificados como enteros y se
+    resuelve con dijkstra_csr.
+    
+    Args:
+        aristas: Lista de tuplas (nodo1, nodo2, peso)
+        nodo_origen: Nodo desde donde calcular las distancias
+    
+    Returns:
+        Tupla con (distancias desde origen, predecesores para reconstruir rutas);
+        los nodos no alcanzables tienen distancia INF
+    
+    Complejidad: O((V + E) log V) con heap binario
+    """
+    # Construir representación CSR
+    # Complejidad: O(V + E log E)
+    id_of, label_of, indptr, indices, weights = construir_csr(aristas)
+    return dijkstra_csr((label_of, indptr, indices, weights), nodo_origen, id_of)
+
+
+def _aristas_de(indptr: np.ndarray, nodos: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Obtiene las posiciones CSR de todas las aristas que salen de un conjunto de nodos.
+    
+    Returns:
+        Tupla con (posiciones de las aristas, nodo origen de cada arista)
+    
+    Complejidad: O(|nodos| + aristas devueltas)
+    """
+    inicios = indptr[nodos]
+    cantidades = indptr[nodos + 1] - inicios
+    desplazamientos = np.repeat(inicios - (np.cumsum(cantidades) - cantidades), cantidades)
+    posiciones = np.arange(desplazamientos.shape[0]) + desplazamientos
+    return posiciones, np.repeat(nodos, cantidades)
+
+
+def _dividir_csr(indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray,
+                 mascara: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Extrae la sub-CSR formada por las aristas seleccionadas por una máscara.
+    
+    Complejidad: O(V + E)
+    """
+    V = indptr.shape[0] - 1
+    origenes = np.repeat(np.arange(V), np.diff(indptr))
+    sub_indptr = np.zeros(V + 1, dtype=indptr.dtype)
+    np.cumsum(np.bincount(origenes[mascara], minlength=V), out=sub_indptr[1:])
+    return sub_indptr, indices[mascara], weights[mascara]
+
+
+def _relajar(indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray,
+             nodos: np.ndarray, dist: np.ndarray, pred: np.ndarray) -> np.ndarray:
+    """
+    Relaja en bloque todas las aristas que salen de un conjunto de nodos.
+    
+    Returns:
+        Ids de los nodos cuya distancia mejoró
+    
+    Complejidad: O(aristas relajadas) más el ordenamiento de los mejorados
+    """
+    posiciones, u = _aristas_de(indptr, nodos)
+    v = indices[posiciones]
+    candidatos = dist[u] + weights[posiciones]
+    mejores = candidatos < dist[v]
+    if not mejores.any():
+        return np.empty(0, dtype=np.int64)
+    
+    u, v, candidatos = u[mejores], v[mejores], candidatos[mejores]
+    # minimum.at conserva la menor candidata cuando un nodo aparece varias veces
+    np.minimum.at(dist, v, candidatos)
+    finales = candidatos == dist[v]
+    pred[v[finales]] = u[finales]
+    return np.unique(v[finales])
+
+
+def _delta_stepping_csr(indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray,
+                        src: int, V: int, delta: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Caminos más cortos con delta-stepping sobre la representación CSR.
+    
+    Los nodos se agrupan en cubetas por dist // delta. Cada cubeta se procesa
+    relajando en bloque sus aristas livianas (peso <= delta) hasta un punto
+    fijo, y después una sola vez las pesadas. Cada relajación es una
+    operación vectorizada sobre todo el conjunto de nodos de la cubeta.
+    
+    Returns:
+        Tupla con (distancias, predecesores) indexadas por id
+        (INF si no es alcanzable, -1 sin predecesor)
+    
+    Complejidad: O(V + E) por fase en el peor caso; en grafos con pesos
+    acotados el número de fases es del orden de (distancia máxima) / delta
+    """
+    livianas = weights <= delta
+    csr_livianas = _dividir_csr(indptr, indices, weights, livianas)
+    csr_pesadas = _dividir_csr(indptr, indices, weights, ~livianas)
+    
+    dist = np.full(V, INF, dtype=np.int64)
+    pred = np.full(V, -1, dtype=np.int32)
+    dist[src] = 0
+    en_cubeta = np.zeros(V, dtype=np.bool_)
+    en_cubeta[src] = True
+    
+    while en_cubeta.any():
+        # Cubeta no vacía de menor índice
+        pendientes = np.flatnonzero(en_cubeta)
+        limite = (int(dist[pendientes].min()) // delta + 1) * delta
+        actuales = pendientes[dist[pendientes] < limite]
         
-        visitados.add(nodo_actual)
+        # Fase liviana: los nodos que mejoran sin salir de la cubeta se reprocesan
+        procesados = []
+        while actuales.size:
+            en_cubeta[actuales] = False
+            procesados.append(actuales)
+            mejorados = _relajar(*csr_livianas, actuales, dist, pred)
+            en_cubeta[mejorados] = True
+            actuales = mejorados[dist[mejorados] < limite]
         
-        # Revisar vecinos
-        for vecino, peso in grafo[nodo_actual]:
-            if vecino in visitados:
-                continue
-            
-            # Calcular nueva distancia
-            nueva_distancia = distancia_actual + peso
-            
-            # Si encontramos un camino más corto, actualizar
-            if nueva_distancia < distancias[vecino]:
-                distancias[vecino] = nueva_distancia
-                predecesores[vecino] = nodo_actual
-                heapq.heappush(heap, (nueva_distancia, vecino))
-    
-    return distancias, predecesores
+        # Fase pesada: una sola vez por cubeta
+        mejorados = _relajar(*csr_pesadas, np.unique(np.concatenate(procesados)), dist, pred)
+        en_cubeta[mejorados] = True
+    
+    return dist, pred
+
+
+def dijkstra_delta_stepping(aristas: List[Tuple[str, str, int]], nodo_origen: str,
+                            delta: Optional[int] = None) -> Tuple[Dict[str, int], Dict[str, str]]:
+    """
+    Caminos más cortos desde un origen con el algoritmo delta-stepping.
+    
+    Alternativa a dijkstra para grafos grandes: en lugar de extraer los nodos de
+    un heap de uno en uno, procesa en bloque todos los nodos de cada cubeta de
+    distancias. Para grafos de menos de 1000 nodos se usa dijkstra directamente.
+    
+    Solo conviene cuando el grafo tiene diámetro pequeño respecto a su tamaño:
+    cada cubeta es una fase con operaciones sobre arrays completos, y en grafos
+    de diámetro grande (caminos, mallas) hay muchas fases con pocos nodos. En
+    un camino de 40 000 nodos tarda del orden de 3 s, frente a 0.05 s de dijkstra.
+    
+    Args:
+        aristas: Lista de tuplas (nodo1, nodo2, peso)
+        nodo_origen: Nodo desde donde calcular las distancias
+        delta: Ancho de las cubetas, entero >= 1 (por defecto, el peso medio de
+               las aristas)
+    
+    Returns:
+        Tupla con (distancias desde origen, predecesores para reconstruir rutas);
+        los nodos no alcanzables tienen distancia INF
+    
+    Complejidad: O(V + E) por fase; el número de fases depende de delta
+    """
+    if delta is not None and delta < 1:
+        print(f"✗ Error: delta debe ser un entero positivo (se recibió {delta})")
+        return {}, {}
+    
+    id_of, label_of, indptr, indices, weights = construir_csr(aristas)
+    
+    # Con una arista negativa la fase liviana no llega a un punto fijo
+    if len(weights) and int(weights.min()) < 0:
+        print("✗ Error: delta-stepping requiere pesos no negativos")
+        return {}, {}
+    
+    if len(label_of) < _UMBRAL_DELTA_STEPPING:
+        return dijkstra_csr((label_of, indptr, indices, weights), nodo_origen, id_of)
+    
+    # Verificar que el nodo origen existe
+    if nodo_origen not in id_of:
+        print(f"✗ Error: El nodo '{nodo_origen}' no existe en el grafo")
+        return {}, {}
+    
+    if delta is None:
+        delta = max(1, int(weights.mean()))
+    
+    distancias, predecesores = _delta_stepping_csr(indptr, indices, weights,
+                                                   id_of[nodo_origen], len(label_of), delta)
+    return _a_etiquetas(label_of, distancias, predecesores)
 
 
 def reconstruir_ruta(predecesores: Dict[str, str], nodo_origen: str, nodo_destino: str) -> List[str]:
@@ -110,6 +569,38 @@ def reconstruir_ruta(predecesores: Dict[str, str], nodo_origen: str, nodo_destin
     return ruta
 
 
+def reconstruir_rutas(predecesores: Dict[str, str], nodo_origen: str) -> Dict[str, List[str]]:
+    """
+    Reconstruye las rutas más cortas desde el origen hacia todos los nodos alcanzables.
+    
+    Cada ruta se obtiene extendiendo la ruta ya calculada de su predecesor, de
+    modo que cada enlace de predecesores se recorre una sola vez.
+    
+    Args:
+        predecesores: Diccionario de predecesores
+        nodo_origen: Nodo de inicio
+    
+    Returns:
+        Diccionario nodo -> lista de nodos en la ruta (de origen a nodo)
+    
+    Complejidad: O(V + L) donde L = suma de las longitudes de las rutas
+    """
+    rutas: Dict[str, List[str]] = {nodo_origen: [nodo_origen]}
+    for nodo in predecesores:
+        # Subir hasta un nodo con ruta conocida
+        pendientes = []
+        while nodo not in rutas:
+            pendientes.append(nodo)
+            nodo = predecesores[nodo]
+        
+        # Completar las rutas de los nodos pendientes en orden
+        for pendiente in reversed(pendientes):
+            rutas[pendiente] = rutas[nodo] + [pendiente]
+            nodo = pendiente
+    
+    return rutas
+
+
 def ejecutar_dijkstra(archivo_csv: str = "data/grafo.csv", nodo_origen: str = None):
     """
     Ejecuta el algoritmo de Dijkstra completo y genera la visualización.
@@ -124,16 +615,14 @@ def ejecutar_dijkstra(archivo_csv: str = "data/grafo.csv", nodo_origen: str = No
     print("ALGORITMO DE DIJKSTRA - CAMINOS MÁS CORTOS")
     print("="*60)
     
-    # Leer grafo
-    aristas = leer_grafo_csv(archivo_csv)
-    if not aristas:
+    # Leer grafo ya codificado (las lecturas y la CSR se reutilizan entre consultas)
+    aristas = leer_edge_arrays_cacheado(archivo_csv)
+    if len(aristas.w) == 0:
         return
+    id_of, label_of, indptr, indices, weights = _load_csr(archivo_csv, os.path.getmtime(archivo_csv))
     
-    # Obtener nodos disponibles
-    nodos = set()
-    for n1, n2, _ in aristas:
-        nodos.add(n1)
-        nodos.add(n2)
+    # Nodos disponibles
+    nodos = label_of
     
     # Si no se especifica nodo origen, pedir al usuario
     if nodo_origen is None:
@@ -141,7 +630,7 @@ def ejecutar_dijkstra(archivo_csv: str = "data/grafo.csv", nodo_origen: str = No
         nodo_origen = input("Ingrese el nodo origen: ").strip()
     
     # Ejecutar Dijkstra
-    distancias, predecesores = dijkstra(aristas, nodo_origen)
+    distancias, predecesores = dijkstra_csr((label_of, indptr, indices, weights), nodo_origen, id_of)
     
     if not distancias:
         return
@@ -150,34 +639,35 @@ def ejecutar_dijkstra(archivo_csv: str = "data/grafo.csv", nodo_origen: str = No
     print(f"\n Distancias mínimas desde '{nodo_origen}':")
     for nodo in sorted(distancias.keys()):
         dist = distancias[nodo]
-        if dist == float('inf'):
+        if dist == INF:
             print(f"   {nodo_origen} → {nodo}: ∞ (no alcanzable)")
         else:
             print(f"   {nodo_origen} → {nodo}: {dist}")
     
     print(f"\n  Rutas completas:")
-    aristas_rutas = []
+    rutas = reconstruir_rutas(predecesores, nodo_origen)
     for nodo_destino in sorted(nodos):
         if nodo_destino == nodo_origen:
             continue
         
-        ruta = reconstruir_ruta(predecesores, nodo_origen, nodo_destino)
+        ruta = rutas.get(nodo_destino)
         if ruta:
             ruta_str = " → ".join(ruta)
             print(f"   {ruta_str} (distancia: {distancias[nodo_destino]})")
-            
-            # Agregar aristas de esta ruta para visualización
-            for i in range(len(ruta) - 1):
-                aristas_rutas.append((ruta[i], ruta[i+1]))
         else:
             print(f"   {nodo_origen} → {nodo_destino}: No hay ruta")
     
+    # Las aristas de todas las rutas forman el árbol de caminos más cortos:
+    # una arista (predecesor, nodo) por cada nodo alcanzable distinto del origen
+    aristas_rutas = [(predecesor, nodo) for nodo, predecesor in predecesores.items()]
+    
     # Crear visualización
-    G = crear_grafo_networkx(aristas)
+    G = crear_grafo_networkx(GrafoCSR(label_of, indptr, indices, weights))
     visualizar_grafo(G, aristas_rutas, 
                      titulo=f"Algoritmo de Dijkstra - Caminos más cortos desde '{nodo_origen}'",
                      archivo_salida="output/dijkstra_paths.png",
-                     nodo_origen=nodo_origen)
+                     nodo_origen=nodo_origen,
+                     clave=calcular_clave(*aristas))
     
     print(f"\n✓ Proceso completado exitosamente")
     print("="*60 + "\n")
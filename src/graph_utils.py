@@ -7,65 +7,557 @@ y visualizar resultados usando NetworkX y Matplotlib.
 Complejidad: O(E) para lectura, donde E es el número de aristas.
 """
 
+import atexit
 import csv
+import functools
+import hashlib
+import os
+import numpy as np
 import networkx as nx
+import matplotlib
+matplotlib.use('Agg')  # Solo se generan PNG: evita inicializar un backend gráfico
 import matplotlib.pyplot as plt
-from typing import List, Tuple
+from matplotlib.collections import LineCollection
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
 
+try:
+    import pandas as pd
+except ImportError:  # pandas es opcional: se usa el lector csv de la biblioteca estándar
+    pd = None
 
-def leer_grafo_csv(archivo: str) -> List[Tuple[str, str, int]]:
+try:
+    from scipy.sparse import coo_matrix, csr_matrix
+except ImportError:  # scipy es opcional: el grafo de NetworkX se arma arista por arista
+    csr_matrix = None
+
+# Tamaño (bytes) a partir del cual conviene el parser en C de pandas
+_UMBRAL_PANDAS = 64 * 1024
+
+# Posiciones de spring_layout ya calculadas, por huella de nodos y aristas del
+# grafo; se conservan las _MAX_LAYOUTS usadas más recientemente
+_MAX_LAYOUTS = 8
+_cache_layouts: "OrderedDict[str, Dict]" = OrderedDict()
+
+# Proceso de fondo que dibuja las imágenes y dibujos aún no terminados
+_ejecutor: Optional[ProcessPoolExecutor] = None
+_pendientes: List[Future] = []
+
+
+class EdgeArrays(NamedTuple):
     """
-    Lee un grafo desde un archivo CSV.
+    Aristas en arrays paralelos (estructura de arrays) con nodos codificados.
+    
+    La arista i va de node_names[src[i]] a node_names[dst[i]] con peso w[i].
+    """
+    src: np.ndarray         # int32
+    dst: np.ndarray         # int32
+    w: np.ndarray           # int16, int32 o int64
+    node_names: np.ndarray  # object
+
+
+class GrafoCSR(NamedTuple):
+    """
+    Grafo no dirigido en representación CSR con nodos codificados.
+    
+    Los vecinos del nodo u están en indices[indptr[u]:indptr[u+1]] con sus
+    pesos en la misma posición de weights; label_of[u] es su nombre.
+    """
+    label_of: Union[List[str], np.ndarray]
+    indptr: np.ndarray   # int32
+    indices: np.ndarray  # int32
+    weights: np.ndarray  # int16, int32 o int64
+
+
+def _leer_dataframe(archivo: str) -> "pd.DataFrame":
+    """
+    Lee las columnas nodo1, nodo2 y peso de un CSV con pandas.
+    
+    Los campos se leen como texto sin interpretar valores faltantes, para que
+    nodos llamados NA, null, None o nan se conserven igual que en el lector csv.
+    Las filas con menos de tres campos llegan con el peso vacío y se descartan.
     
     Args:
         archivo: Ruta al archivo CSV con formato: nodo1,nodo2,peso
     
     Returns:
-        Lista de tuplas (nodo1, nodo2, peso) representando las aristas
+        DataFrame con columnas n1, n2 (str) y w (int)
+    
+    Complejidad: O(E) donde E es el número de aristas
+    """
+    df = pd.read_csv(archivo, header=None, names=['n1', 'n2', 'w'], usecols=[0, 1, 2],
+                     dtype=str, na_filter=False, encoding='utf-8')
+    pesos = df['w'].str.strip()
+    completas = pesos != ''
+    return pd.DataFrame({'n1': df['n1'][completas].str.strip(),
+                         'n2': df['n2'][completas].str.strip(),
+                         'w': pesos[completas].astype(np.int64)})
+
+
+def _reducir_pesos(w: np.ndarray) -> np.ndarray:
+    """
+    Convierte los pesos al entero con signo más angosto que los contiene.
+    
+    Con int16 o int32 el ordenamiento y los recorridos mueven la mitad (o la
+    cuarta parte) de bytes que con int64. Las sumas de pesos se acumulan en int64.
+    
+    Args:
+        w: Array de pesos enteros
+    
+    Returns:
+        Array de pesos como int16, int32 o int64
+    
+    Complejidad: O(E)
+    """
+    if len(w) == 0:
+        return w.astype(np.int64, copy=False)
+    
+    minimo, maximo = int(w.min()), int(w.max())
+    for tipo in (np.int16, np.int32):
+        limites = np.iinfo(tipo)
+        if limites.min <= minimo and maximo <= limites.max:
+            return w.astype(tipo)
+    return w.astype(np.int64, copy=False)
+
+
+def _csr_desde_ids(u: np.ndarray, v: np.ndarray, w: np.ndarray,
+                   V: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Construye los arrays CSR de un grafo no dirigido a partir de aristas con ids.
+    
+    Args:
+        u: Ids del primer extremo de cada arista
+        v: Ids del segundo extremo de cada arista
+        w: Pesos de las aristas
+        V: Número de nodos
+    
+    Returns:
+        Tupla con (indptr, indices, weights)
+    
+    Complejidad: O(V + E log E) por el ordenamiento de aristas por origen
+    """
+    # Cada arista no dirigida aparece en ambos sentidos
+    origenes = np.concatenate((u, v)).astype(np.int32, copy=False)
+    destinos = np.concatenate((v, u)).astype(np.int32, copy=False)
+    pesos = np.concatenate((w, w))
+    
+    # Ordenar por nodo origen y llenar indices/weights en una sola pasada
+    orden = np.argsort(origenes, kind='stable')
+    indices = destinos[orden]
+    weights = pesos[orden]
+    
+    indptr = np.zeros(V + 1, dtype=np.int32)
+    np.cumsum(np.bincount(origenes, minlength=V), out=indptr[1:])
+    
+    return indptr, indices, weights
+
+
+def _codificar_nodos(extremos: np.ndarray) -> Tuple[np.ndarray, List[str]]:
+    """
+    Asigna a cada nodo un id entero contiguo en orden de aparición.
+    
+    Con pandas se usa pd.factorize (tabla hash en C). Sin pandas, np.unique
+    sobre una copia de ancho fijo de los nombres (comparar cadenas de ancho
+    fijo es mucho más rápido que comparar objetos de Python) y los ids se
+    renumeran según la primera aparición de cada nodo.
+    
+    Args:
+        extremos: Array con los nombres de los nodos (con repeticiones)
+    
+    Returns:
+        Tupla con (id de cada elemento de extremos, nombres de los nodos por id)
+    
+    Complejidad: O(E) con pandas, O(E log E) sin pandas
+    """
+    if pd is not None:
+        ids, nodos = pd.factorize(extremos)
+        return ids, nodos.tolist()
+    
+    if len(extremos) == 0:
+        return np.empty(0, dtype=np.int64), []
+    
+    # ids ordenados alfabéticamente -> ids por orden de primera aparición
+    _, primeros, inversa = np.unique(extremos.astype(str), return_index=True, return_inverse=True)
+    orden = np.argsort(primeros)
+    renumerar = np.empty(len(orden), dtype=np.int64)
+    renumerar[orden] = np.arange(len(orden))
+    return renumerar[inversa.ravel()], extremos[primeros[orden]].tolist()
+
+
+def codificar_aristas(n1: np.ndarray, n2: np.ndarray, w: np.ndarray) -> EdgeArrays:
+    """
+    Codifica los extremos de las aristas como ids enteros en orden de aparición.
+    
+    Args:
+        n1: Nombres del primer extremo de cada arista
+        n2: Nombres del segundo extremo de cada arista
+        w: Pesos de las aristas
+    
+    Returns:
+        EdgeArrays con las aristas codificadas
+    
+    Complejidad: O(E)
+    """
+    # Extremos intercalados (n1, n2 de cada arista) para numerar en orden de aparición
+    extremos = np.column_stack((n1, n2)).ravel()
+    ids, label_of = _codificar_nodos(extremos)
+    return EdgeArrays(ids[0::2].astype(np.int32), ids[1::2].astype(np.int32),
+                      np.asarray(w), np.array(label_of, dtype=object))
+
+
+def construir_csr_desde_arrays(n1: np.ndarray, n2: np.ndarray, w: np.ndarray) -> GrafoCSR:
+    """
+    Construye la representación CSR del grafo a partir de arrays de aristas.
+    
+    Args:
+        n1: Nombres del primer extremo de cada arista
+        n2: Nombres del segundo extremo de cada arista
+        w: Pesos de las aristas
+    
+    Returns:
+        GrafoCSR con (label_of, indptr, indices, weights)
+    
+    Complejidad: O(V + E log E) por el ordenamiento de aristas por origen
+    """
+    return csr_desde_edge_arrays(codificar_aristas(n1, n2, w))
+
+
+def csr_desde_edge_arrays(aristas: EdgeArrays) -> GrafoCSR:
+    """
+    Construye la representación CSR del grafo a partir de aristas ya codificadas.
+    
+    Args:
+        aristas: EdgeArrays con las aristas del grafo
+    
+    Returns:
+        GrafoCSR con (label_of, indptr, indices, weights)
+    
+    Complejidad: O(V + E log E) por el ordenamiento de aristas por origen
+    """
+    indptr, indices, weights = _csr_desde_ids(aristas.src, aristas.dst, aristas.w,
+                                              len(aristas.node_names))
+    return GrafoCSR(aristas.node_names.tolist(), indptr, indices, weights)
+
+
+def construir_csr(aristas: List[Tuple[str, str, int]]) -> Tuple[Dict[str, int], List[str],
+                                                               np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Construye la representación CSR (Compressed Sparse Row) del grafo no dirigido.
+    
+    Los nodos se codifican como enteros contiguos en orden de aparición y cada
+    arista se almacena en ambos sentidos. Los vecinos del nodo u quedan en
+    indices[indptr[u]:indptr[u+1]] con sus pesos en la misma posición de weights.
+    
+    Args:
+        aristas: Lista de tuplas (nodo1, nodo2, peso)
+    
+    Returns:
+        Tupla con (id_of, label_of, indptr, indices, weights)
+    
+    Complejidad: O(V + E log E) por el ordenamiento de aristas por origen
+    """
+    n1, n2, w = aristas_a_arrays(aristas)
+    label_of, indptr, indices, weights = construir_csr_desde_arrays(n1, n2, w)
+    id_of = {nodo: i for i, nodo in enumerate(label_of)}
+    return id_of, label_of, indptr, indices, weights
+
+
+def aristas_a_arrays(aristas: List[Tuple[str, str, int]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Convierte una lista de aristas en tres arrays paralelos.
+    
+    Args:
+        aristas: Lista de tuplas (nodo1, nodo2, peso)
+    
+    Returns:
+        Tupla con (n1, n2, w): nombres de los extremos (object) y pesos en el
+        entero más angosto que los contiene
+    
+    Complejidad: O(E)
+    """
+    E = len(aristas)
+    n1 = np.array([nodo1 for nodo1, _, _ in aristas], dtype=object)
+    n2 = np.array([nodo2 for _, nodo2, _ in aristas], dtype=object)
+    w = np.fromiter((peso for _, _, peso in aristas), dtype=np.int64, count=E)
+    return n1, n2, _reducir_pesos(w)
+
+
+def leer_grafo_arrays(archivo: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Lee un grafo desde un archivo CSV directamente en arrays paralelos.
+    
+    No construye la lista intermedia de tuplas: con archivos grandes las
+    columnas salen del parser en C de pandas como arrays.
+    
+    Args:
+        archivo: Ruta al archivo CSV con formato: nodo1,nodo2,peso
+    
+    Returns:
+        Tupla con (n1, n2, w): nombres de los extremos (object) y pesos en el
+        entero más angosto que los contiene; arrays vacíos si hubo un error
     
     Complejidad: O(E) donde E es el número de aristas
     """
-    aristas = []
     try:
-        with open(archivo, 'r', encoding='utf-8') as f:
-            lector = csv.reader(f)
-            for fila in lector:
-                if len(fila) >= 3:
-                    nodo1 = fila[0].strip()
-                    nodo2 = fila[1].strip()
-                    peso = int(fila[2].strip())
-                    aristas.append((nodo1, nodo2, peso))
-        print(f"✓ Grafo cargado: {len(aristas)} aristas")
-        return aristas
+        # Archivos grandes: parser en C de pandas en lugar de una fila por iteración
+        if pd is not None and os.path.getsize(archivo) >= _UMBRAL_PANDAS:
+            df = _leer_dataframe(archivo)
+            n1 = df['n1'].to_numpy(dtype=object)
+            n2 = df['n2'].to_numpy(dtype=object)
+            w = df['w'].to_numpy(dtype=np.int64)
+        else:
+            nodos1, nodos2, pesos = [], [], []
+            with open(archivo, 'r', encoding='utf-8') as f:
+                lector = csv.reader(f)
+                for fila in lector:
+                    if len(fila) >= 3:
+                        nodos1.append(fila[0].strip())
+                        nodos2.append(fila[1].strip())
+                        pesos.append(int(fila[2].strip()))
+            n1 = np.array(nodos1, dtype=object)
+            n2 = np.array(nodos2, dtype=object)
+            w = np.array(pesos, dtype=np.int64)
+        print(f"✓ Grafo cargado: {len(w)} aristas")
+        return n1, n2, _reducir_pesos(w)
     except FileNotFoundError:
         print(f"✗ Error: No se encontró el archivo {archivo}")
-        return []
     except Exception as e:
         print(f"✗ Error al leer el grafo: {e}")
-        return []
+    return np.empty(0, dtype=object), np.empty(0, dtype=object), np.empty(0, dtype=np.int64)
 
 
-def crear_grafo_networkx(aristas: List[Tuple[str, str, int]]) -> nx.Graph:
+def leer_grafo_csv(archivo: str, como_arrays: bool = False) -> Union[List[Tuple[str, str, int]], EdgeArrays]:
+    """
+    Lee un grafo desde un archivo CSV.
+    
+    Envuelve leer_grafo_arrays para quienes necesitan la lista de tuplas.
+    
+    Args:
+        archivo: Ruta al archivo CSV con formato: nodo1,nodo2,peso
+        como_arrays: Si es True, devuelve EdgeArrays en lugar de la lista
+    
+    Returns:
+        Lista de tuplas (nodo1, nodo2, peso) representando las aristas,
+        o EdgeArrays si como_arrays es True
+    
+    Complejidad: O(E) donde E es el número de aristas
+    """
+    n1, n2, w = leer_grafo_arrays(archivo)
+    if como_arrays:
+        return codificar_aristas(n1, n2, w)
+    return list(zip(n1.tolist(), n2.tolist(), w.tolist()))
+
+
+@functools.lru_cache(maxsize=8)
+def _leer_grafo_csv_version(archivo: str, mtime: float) -> Tuple[Tuple[str, str, int], ...]:
+    """
+    Lee un grafo una sola vez por versión del archivo (ruta, fecha de modificación).
+    
+    Devuelve una tupla para que el resultado compartido por la caché sea inmutable.
+    
+    Complejidad: O(E) la primera vez, O(1) en las siguientes
+    """
+    return tuple(leer_grafo_csv(archivo))
+
+
+def leer_grafo_csv_cacheado(archivo: str) -> List[Tuple[str, str, int]]:
+    """
+    Lee un grafo desde un archivo CSV reutilizando lecturas previas del mismo archivo.
+    
+    La caché se indexa por ruta y fecha de modificación, de modo que un archivo
+    editado se vuelve a leer.
+    
+    Args:
+        archivo: Ruta al archivo CSV con formato: nodo1,nodo2,peso
+    
+    Returns:
+        Lista de tuplas (nodo1, nodo2, peso) representando las aristas
+    
+    Complejidad: O(E) la primera vez por versión del archivo
+    """
+    if not os.path.exists(archivo):
+        return leer_grafo_csv(archivo)
+    return list(_leer_grafo_csv_version(archivo, os.path.getmtime(archivo)))
+
+
+@functools.lru_cache(maxsize=8)
+def _leer_edge_arrays_version(archivo: str, mtime: float) -> EdgeArrays:
+    """
+    Lee y codifica un grafo una sola vez por versión del archivo (ruta, fecha de modificación).
+    
+    Los arrays se marcan como de solo lectura porque la caché los comparte.
+    
+    Complejidad: O(E) la primera vez, O(1) en las siguientes
+    """
+    aristas = leer_grafo_csv(archivo, como_arrays=True)
+    for array in aristas:
+        array.flags.writeable = False
+    return aristas
+
+
+def leer_edge_arrays_cacheado(archivo: str) -> EdgeArrays:
+    """
+    Lee un grafo desde un archivo CSV como EdgeArrays reutilizando lecturas previas.
+    
+    Igual que leer_grafo_csv_cacheado, pero sin la lista intermedia de tuplas:
+    las aristas pasan del lector a arrays codificados que los algoritmos usan
+    directamente. La caché se indexa por ruta y fecha de modificación.
+    
+    Args:
+        archivo: Ruta al archivo CSV con formato: nodo1,nodo2,peso
+    
+    Returns:
+        EdgeArrays con las aristas del grafo (vacío si hubo un error)
+    
+    Complejidad: O(E) la primera vez por versión del archivo
+    """
+    if not os.path.exists(archivo):
+        return leer_grafo_csv(archivo, como_arrays=True)
+    return _leer_edge_arrays_version(archivo, os.path.getmtime(archivo))
+
+
+def leer_grafo_csv_arrays(archivo: str) -> GrafoCSR:
+    """
+    Lee un grafo desde un archivo CSV directamente en representación CSR.
+    
+    No se construye la lista intermedia de tuplas: las aristas pasan de
+    leer_grafo_arrays a CSR y, con pandas disponible, los nodos se codifican
+    con pd.factorize (orden de aparición).
+    
+    Args:
+        archivo: Ruta al archivo CSV con formato: nodo1,nodo2,peso
+    
+    Returns:
+        GrafoCSR con label_of como array de objetos; sin nodos si hubo un error
+    
+    Complejidad: O(V + E log E)
+    """
+    csr = construir_csr_desde_arrays(*leer_grafo_arrays(archivo))
+    return csr._replace(label_of=np.array(csr.label_of, dtype=object))
+
+
+def _grafo_desde_matriz(matriz, node_names: np.ndarray) -> nx.Graph:
+    """
+    Crea el grafo de NetworkX desde una matriz dispersa y restaura los nombres.
+    
+    Complejidad: O(V + E)
+    """
+    G = nx.from_scipy_sparse_array(matriz)
+    return nx.relabel_nodes(G, dict(enumerate(node_names)))
+
+
+def crear_grafo_networkx(aristas: Union[List[Tuple[str, str, int]], EdgeArrays, GrafoCSR]) -> nx.Graph:
     """
     Crea un grafo de NetworkX a partir de una lista de aristas.
     
+    También acepta las representaciones ya construidas por los algoritmos:
+    EdgeArrays o GrafoCSR. En ese caso, con scipy disponible, el grafo se arma
+    desde una matriz dispersa sin recorrer las aristas en Python.
+    
     Args:
-        aristas: Lista de tuplas (nodo1, nodo2, peso)
+        aristas: Lista de tuplas (nodo1, nodo2, peso), EdgeArrays o GrafoCSR
     
     Returns:
         Grafo de NetworkX
     
-    Complejidad: O(E) donde E es el número de aristas
+    Complejidad: O(V + E) donde E es el número de aristas
     """
+    if isinstance(aristas, EdgeArrays):
+        V = len(aristas.node_names)
+        if csr_matrix is not None:
+            matriz = coo_matrix((aristas.w, (aristas.src, aristas.dst)), shape=(V, V))
+            return _grafo_desde_matriz(matriz, aristas.node_names)
+        nombres = aristas.node_names
+        aristas = list(zip(nombres[aristas.src].tolist(), nombres[aristas.dst].tolist(),
+                           aristas.w.tolist()))
+    elif isinstance(aristas, GrafoCSR):
+        label_of, indptr, indices, weights = aristas
+        V = len(label_of)
+        if csr_matrix is not None:
+            return _grafo_desde_matriz(csr_matrix((weights, indices, indptr), shape=(V, V)), label_of)
+        # Sin scipy: nodos primero, para conservar su orden, y luego cada fila CSR
+        nombres = np.asarray(label_of, dtype=object)
+        origenes = np.repeat(np.arange(V), np.diff(indptr))
+        G = nx.Graph()
+        G.add_nodes_from(nombres.tolist())
+        G.add_weighted_edges_from(zip(nombres[origenes].tolist(), nombres[indices].tolist(),
+                                      weights.tolist()))
+        return G
+    
     G = nx.Graph()
     for nodo1, nodo2, peso in aristas:
         G.add_edge(nodo1, nodo2, weight=peso)
     return G
 
 
+def calcular_clave(*partes) -> str:
+    """
+    Calcula una huella corta de los datos de entrada de una visualización.
+    
+    Args:
+        partes: Datos de entrada (bytes y arrays numéricos de NumPy se usan
+                byte a byte; el resto por su repr)
+    
+    Returns:
+        Huella hexadecimal BLAKE2b de 8 bytes
+    
+    Complejidad: O(n) donde n = tamaño de los datos
+    """
+    h = hashlib.blake2b(digest_size=8)
+    for parte in partes:
+        if isinstance(parte, np.ndarray) and parte.dtype != object:
+            parte = parte.dtype.str.encode('ascii') + parte.tobytes()
+        elif isinstance(parte, np.ndarray):
+            parte = parte.tolist()
+        h.update(parte if isinstance(parte, bytes) else repr(parte).encode('utf-8'))
+    return h.hexdigest()
+
+
+def requiere_render(archivo_salida: str, clave: Optional[str]) -> bool:
+    """
+    Indica si una imagen debe generarse de nuevo.
+    
+    La clave del último render se guarda junto a la imagen en archivo_salida + '.sha';
+    si la imagen existe y la clave coincide, el render puede omitirse.
+    
+    Args:
+        archivo_salida: Nombre del archivo PNG de salida
+        clave: Huella de los datos de entrada (None fuerza el render)
+    
+    Returns:
+        True si hay que generar la imagen
+    
+    Complejidad: O(1)
+    """
+    if clave is None or not os.path.exists(archivo_salida):
+        return True
+    try:
+        with open(archivo_salida + '.sha', 'r', encoding='utf-8') as f:
+            return f.read().strip() != clave
+    except OSError:
+        return True
+
+
+def registrar_render(archivo_salida: str, clave: Optional[str]):
+    """
+    Guarda la clave de los datos con los que se generó una imagen.
+    
+    Args:
+        archivo_salida: Nombre del archivo PNG de salida
+        clave: Huella de los datos de entrada (None no guarda nada)
+    
+    Complejidad: O(1)
+    """
+    if clave is None:
+        return
+    with open(archivo_salida + '.sha', 'w', encoding='utf-8') as f:
+        f.write(clave)
+
+
 def visualizar_grafo(G: nx.Graph, aristas_resaltadas: List[Tuple] = None, 
                      titulo: str = "Grafo", archivo_salida: str = "grafo.png",
-                     nodo_origen: str = None):
+                     nodo_origen: str = None, dpi: int = 150, clave: Optional[str] = None):
     """
     Visualiza un grafo usando Matplotlib y lo guarda como PNG.
     
@@ -75,43 +567,157 @@ def visualizar_grafo(G: nx.Graph, aristas_resaltadas: List[Tuple] = None,
         titulo: Título del gráfico
         archivo_salida: Nombre del archivo PNG de salida
         nodo_origen: Nodo origen a resaltar (opcional)
+        dpi: Resolución de la imagen de salida
+        clave: Huella del grafo de entrada; si coincide con la del último
+               render, la imagen existente se reutiliza
     
     Complejidad: O(V + E) donde V es vértices y E es aristas
     """
+    # Lo que se dibuja además del grafo también forma parte de la clave
+    if clave is not None:
+        clave = calcular_clave(clave, aristas_resaltadas, titulo, nodo_origen, dpi)
+    if not requiere_render(archivo_salida, clave):
+        print(f"✓ Imagen sin cambios: {archivo_salida}")
+        return
+    
     plt.figure(figsize=(12, 8))
+    ax = plt.gca()
     
     # Usar spring_layout en lugar de graphviz_layout
-    pos = nx.spring_layout(G, seed=42, k=2, iterations=50)
+    # El layout depende solo de la estructura del grafo: se reutiliza entre llamadas
+    clave_layout = calcular_clave(tuple(G.nodes()), tuple(G.edges(data='weight')))
+    pos = _cache_layouts.get(clave_layout)
+    if pos is None:
+        pos = nx.spring_layout(G, seed=42, k=2, iterations=50)
+        _cache_layouts[clave_layout] = pos
+        if len(_cache_layouts) > _MAX_LAYOUTS:
+            _cache_layouts.popitem(last=False)
+    else:
+        _cache_layouts.move_to_end(clave_layout)
     
+    # Cada grupo de elementos se dibuja como un único artista de Matplotlib
     # Dibujar todas las aristas en gris claro
-    nx.draw_networkx_edges(G, pos, edge_color='lightgray', width=2, alpha=0.6)
+    aristas = list(G.edges())
+    segmentos = [(pos[u], pos[v]) for u, v in aristas]
+    ax.add_collection(LineCollection(segmentos, colors='lightgray', linewidths=2,
+                                     alpha=0.6, zorder=1))
     
     # Dibujar aristas resaltadas
     if aristas_resaltadas:
-        nx.draw_networkx_edges(G, pos, edgelist=aristas_resaltadas, 
-                                edge_color='red', width=3)
+        segmentos_resaltados = [(pos[u], pos[v]) for u, v in aristas_resaltadas]
+        ax.add_collection(LineCollection(segmentos_resaltados, colors='red',
+                                         linewidths=3, zorder=2))
     
     # Dibujar nodos
-    node_colors = []
-    for node in G.nodes():
-        if nodo_origen and node == nodo_origen:
-            node_colors.append('gold')
-        else:
-            node_colors.append('lightblue')
-    
-    nx.draw_networkx_nodes(G, pos, node_color=node_colors, 
-                           node_size=700, edgecolors='black', linewidths=2)
+    nodos = list(G.nodes())
+    node_colors = ['gold' if nodo_origen and node == nodo_origen else 'lightblue'
+                   for node in nodos]
+    ax.scatter([pos[n][0] for n in nodos], [pos[n][1] for n in nodos], s=700,
+               c=node_colors, edgecolors='black', linewidths=2, zorder=3)
     
     # Dibujar etiquetas de nodos
-    nx.draw_networkx_labels(G, pos, font_size=12, font_weight='bold')
+    for node in nodos:
+        x, y = pos[node]
+        ax.text(x, y, str(node), fontsize=12, fontweight='bold',
+                ha='center', va='center', zorder=4)
     
-    # Dibujar pesos de aristas
-    edge_labels = nx.get_edge_attributes(G, 'weight')
-    nx.draw_networkx_edge_labels(G, pos, edge_labels, font_size=10)
+    # Dibujar pesos de aristas en el punto medio de cada arista
+    for u, v, peso in G.edges(data='weight'):
+        (x1, y1), (x2, y2) = pos[u], pos[v]
+        ax.text((x1 + x2) / 2, (y1 + y2) / 2, str(peso), fontsize=10,
+                ha='center', va='center', zorder=4,
+                bbox=dict(boxstyle='round', ec='white', fc='white'))
+    
+    ax.autoscale_view()
+    ax.margins(0.08)
     
     plt.title(titulo, fontsize=16, fontweight='bold')
     plt.axis('off')
-    plt.tight_layout()
-    plt.savefig(archivo_salida, dpi=300, bbox_inches='tight', facecolor='white')
+    # Márgenes fijos: bbox_inches='tight' renderiza la figura una vez más
+    plt.subplots_adjust(left=0.02, right=0.98, bottom=0.02, top=0.93)
+    plt.savefig(archivo_salida, dpi=dpi, facecolor='white')
     plt.close()
-    print(f"✓ Imagen guardada: {archivo_salida}")
\ No newline at end of file
+    registrar_render(archivo_salida, clave)
+    print(f"✓ Imagen guardada: {archivo_salida}")
+
+
+def _dibujar_grafo(aristas, aristas_resaltadas: List[Tuple],
+                   titulo: str, archivo_salida: str, clave: Optional[str]):
+    """
+    Construye el grafo de NetworkX y lo dibuja; se ejecuta en el proceso de fondo.
+    
+    Complejidad: O(V + E) más el costo de renderizado
+    """
+    G = crear_grafo_networkx(aristas)
+    visualizar_grafo(G, aristas_resaltadas, titulo=titulo, archivo_salida=archivo_salida, clave=clave)
+
+
+def _informar_error(futuro: Future):
+    """
+    Muestra el error de un dibujo terminado, si lo hubo.
+    
+    Complejidad: O(1) si el dibujo ya terminó
+    """
+    try:
+        futuro.result()
+    except Exception as e:
+        print(f"✗ Error al generar la imagen: {e}")
+
+
+def _revisar_terminados():
+    """
+    Informa los errores de los dibujos ya terminados y los quita de la lista.
+    
+    Complejidad: O(p) donde p = dibujos pendientes
+    """
+    for futuro in [f for f in _pendientes if f.done()]:
+        _informar_error(futuro)
+        _pendientes.remove(futuro)
+
+
+def _esperar_visualizaciones():
+    """
+    Espera los dibujos pendientes al terminar el programa.
+    
+    Complejidad: O(1) más lo que falte por renderizar
+    """
+    for futuro in _pendientes:
+        _informar_error(futuro)
+    _pendientes.clear()
+    if _ejecutor is not None:
+        _ejecutor.shutdown()
+
+
+def visualizar_grafo_en_segundo_plano(aristas,
+                                      aristas_resaltadas: List[Tuple] = None,
+                                      titulo: str = "Grafo",
+                                      archivo_salida: str = "output/grafo.png",
+                                      clave: Optional[str] = None):
+    """
+    Construye y dibuja el grafo en un proceso aparte, sin bloquear al llamador.
+    
+    Matplotlib corre en otro proceso (fuera del GIL) y la función vuelve de
+    inmediato; los dibujos pendientes se esperan al salir del programa.
+    
+    Como el dibujo termina después, el mensaje "✓ Imagen guardada" del proceso
+    de fondo puede aparecer más tarde en la salida (por ejemplo, junto al menú).
+    Los errores de un dibujo se informan en la siguiente llamada a esta
+    función o, si no la hay, al salir del programa.
+    
+    Args:
+        aristas: Lista de tuplas (nodo1, nodo2, peso), EdgeArrays o GrafoCSR
+                 (ver crear_grafo_networkx)
+        aristas_resaltadas: Lista de aristas a resaltar (opcional)
+        titulo: Título del gráfico
+        archivo_salida: Ruta donde guardar la imagen
+        clave: Huella de los datos para omitir renderizados repetidos (opcional)
+    
+    Complejidad: O(1) para el llamador
+    """
+    global _ejecutor
+    _revisar_terminados()
+    if _ejecutor is None:
+        _ejecutor = ProcessPoolExecutor(max_workers=1)
+        atexit.register(_esperar_visualizaciones)
+    _pendientes.append(_ejecutor.submit(_dibujar_grafo, aristas, aristas_resaltadas,
+                                        titulo, archivo_salida, clave))
@@ -8,11 +8,18 @@ caracteres más frecuentes.
 Complejidad: O(n log n) donde n = número de caracteres únicos
 """
 
-import heapq
-from typing import Dict, Tuple, Optional
-from collections import Counter
+from typing import Deque, Dict, Iterator, Tuple, Optional
+from collections import Counter, deque
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Solo se generan PNG: evita inicializar un backend gráfico
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 import networkx as nx
+from src.graph_utils import calcular_clave, requiere_render, registrar_render
+
+# Por debajo de este tamaño Counter es más rápido que preparar el buffer de NumPy
+_UMBRAL_BINCOUNT = 4096
 
 
 class NodoHuffman:
@@ -23,6 +30,8 @@ class NodoHuffman:
     o dos hijos (nodos internos).
     """
     
+    __slots__ = ('caracter', 'frecuencia', 'izquierdo', 'derecho')
+    
     def __init__(self, caracter: Optional[str], frecuencia: int, 
                  izquierdo: Optional['NodoHuffman'] = None, 
                  derecho: Optional['NodoHuffman'] = None):
@@ -40,10 +49,6 @@ class NodoHuffman:
         self.izquierdo = izquierdo
         self.derecho = derecho
     
-    def __lt__(self, otro):
-        """Comparador para el heap (por frecuencia)."""
-        return self.frecuencia < otro.frecuencia
-    
     def es_hoja(self) -> bool:
         """Verifica si el nodo es una hoja."""
         return self.izquierdo is None and self.derecho is None
@@ -53,6 +58,10 @@ def calcular_frecuencias(texto: str) -> Dict[str, int]:
     """
     Calcula la frecuencia de cada carácter en el texto.
     
+    Para textos grandes cuyos caracteres caben en un byte (Latin-1) el
+    histograma se calcula con np.bincount sobre el buffer de bytes; en otro
+    caso se usa Counter.
+    
     Args:
         texto: Texto a analizar
     
@@ -61,75 +70,175 @@ def calcular_frecuencias(texto: str) -> Dict[str, int]:
     
     Complejidad: O(m) donde m = longitud del texto
     """
-    return dict(Counter(texto))
+    if len(texto) < _UMBRAL_BINCOUNT:
+        return dict(Counter(texto))
+    
+    try:
+        buffer = texto.encode('latin-1')
+    except UnicodeEncodeError:
+        # Hay caracteres fuera de Latin-1: no caben en un byte
+        return dict(Counter(texto))
+    
+    conteos = np.bincount(np.frombuffer(buffer, dtype=np.uint8), minlength=256)
+    return {chr(byte): int(conteos[byte]) for byte in np.flatnonzero(conteos).tolist()}
+
+
+def _extraer_minimo(hojas: Deque[NodoHuffman], internos: Deque[NodoHuffman]) -> NodoHuffman:
+    """
+    Extrae el nodo de menor frecuencia entre los frentes de las dos colas.
+    
+    Ante empate se prefiere la hoja, lo que minimiza la longitud máxima de código.
+    
+    Complejidad: O(1)
+    """
+    if not internos or (hojas and hojas[0].frecuencia <= internos[0].frecuencia):
+        return hojas.popleft()
+    return internos.popleft()
 
 
-def construir_arbol_huffman(frecuencias: Dict[str, int]) -> Optional[NodoHuffman]:
+def construir_arbol_huffman(frecuencias: Dict[str, int]) -> Tuple[Optional[NodoHuffman], int]:
     """
     Construye el árbol de Huffman a partir de las frecuencias.
     
+    Usa la construcción con dos colas: las hojas ordenadas por frecuencia y los
+    nodos internos, que se crean ya en orden no decreciente. Los dos nodos de
+    menor frecuencia siempre están en los frentes de las colas.
+    
+    Además calcula la longitud de camino ponderada del árbol (bits totales del
+    texto codificado), que es igual a la suma de las frecuencias de los nodos
+    internos creados en cada combinación.
+    
     Args:
         frecuencias: Diccionario con frecuencias de caracteres
     
     Returns:
-        Raíz del árbol de Huffman
+        Tupla con (raíz del árbol de Huffman, bits del texto comprimido)
     
-    Complejidad: O(n log n) donde n = número de caracteres únicos
+    Complejidad: O(n log n) por el ordenamiento inicial; O(n) la construcción
     """
     if not frecuencias:
-        return None
+        return None, 0
     
-    # Crear heap con nodos hoja
+    # Cola de hojas ordenadas por frecuencia
     # Complejidad: O(n log n)
-    heap = [NodoHuffman(char, freq) for char, freq in frecuencias.items()]
-    heapq.heapify(heap)
+    items = sorted(frecuencias.items(), key=lambda x: x[1])
+    hojas = deque(NodoHuffman(char, freq) for char, freq in items)
+    internos: Deque[NodoHuffman] = deque()
+    
+    # Con un solo carácter el código es "0": un bit por aparición
+    if len(hojas) == 1:
+        return hojas[0], hojas[0].frecuencia
     
     # Construir árbol combinando nodos de menor frecuencia
-    # Complejidad: O(n log n)
-    while len(heap) > 1:
-        izq = heapq.heappop(heap)
-        der = heapq.heappop(heap)
+    # Complejidad: O(n)
+    bits_totales = 0
+    while len(hojas) + len(internos) > 1:
+        izq = _extraer_minimo(hojas, internos)
+        der = _extraer_minimo(hojas, internos)
         
         # Crear nodo padre con suma de frecuencias
         padre = NodoHuffman(None, izq.frecuencia + der.frecuencia, izq, der)
-        heapq.heappush(heap, padre)
+        bits_totales += padre.frecuencia
+        internos.append(padre)
     
-    return heap[0] if heap else None
+    return internos[0], bits_totales
 
 
-def generar_codigos(raiz: Optional[NodoHuffman], codigo: str = "", 
-                    codigos: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+def _recorrer_codigos(raiz: Optional[NodoHuffman]) -> Iterator[Tuple[str, int, int]]:
+    """
+    Recorre el árbol y produce (carácter, bits, longitud) para cada hoja.
+    
+    El recorrido es iterativo con una pila explícita y cada código se lleva
+    como entero: el bit i-ésimo desde la raíz es el más significativo.
+    
+    Complejidad: O(n) donde n = número de nodos
+    """
+    if raiz is None:
+        return
+    
+    # Pila de (nodo, bits del código, longitud del código)
+    pila = [(raiz, 0, 0)]
+    while pila:
+        nodo, bits, longitud = pila.pop()
+        
+        # Si es hoja, emitir código (un árbol de una sola hoja usa "0")
+        if nodo.es_hoja():
+            yield nodo.caracter, bits, max(longitud, 1)
+            continue
+        
+        # Derecho ('1') primero para recorrer el izquierdo ('0') antes
+        pila.append((nodo.derecho, (bits << 1) | 1, longitud + 1))
+        pila.append((nodo.izquierdo, bits << 1, longitud + 1))
+
+
+def generar_codigos(raiz: Optional[NodoHuffman]) -> Dict[str, str]:
     """
     Genera los códigos de Huffman mediante recorrido del árbol.
     
+    La cadena de '0'/'1' de cada código solo se materializa al llegar a una hoja.
+    
     Args:
         raiz: Raíz del árbol de Huffman
-        codigo: Código actual (para recursión)
-        codigos: Diccionario de códigos (para recursión)
     
     Returns:
         Diccionario con los códigos de cada carácter
     
     Complejidad: O(n) donde n = número de nodos
     """
-    if codigos is None:
-        codigos = {}
+    return {caracter: format(bits, f'0{longitud}b')
+            for caracter, bits, longitud in _recorrer_codigos(raiz)}
+
+
+def generar_codigos_empaquetados(raiz: Optional[NodoHuffman]) -> Dict[str, Tuple[int, int]]:
+    """
+    Genera los códigos de Huffman como pares (bits, longitud).
     
-    if raiz is None:
-        return codigos
+    Es la forma compacta de la tabla que usa codificar: cada código es un entero
+    en lugar de un string con un carácter por bit.
     
-    # Si es hoja, guardar código
-    if raiz.es_hoja():
-        codigos[raiz.caracter] = codigo if codigo else "0"
-        return codigos
+    Args:
+        raiz: Raíz del árbol de Huffman
     
-    # Recorrer subárbol izquierdo (agregar '0')
-    generar_codigos(raiz.izquierdo, codigo + "0", codigos)
+    Returns:
+        Diccionario carácter -> (bits del código, longitud en bits)
     
-    # Recorrer subárbol derecho (agregar '1')
-    generar_codigos(raiz.derecho, codigo + "1", codigos)
+    Complejidad: O(n) donde n = número de nodos
+    """
+    return {caracter: (bits, longitud) for caracter, bits, longitud in _recorrer_codigos(raiz)}
+
+
+def codificar(texto: str, codigos: Dict[str, Tuple[int, int]]) -> bytes:
+    """
+    Codifica un texto con una tabla de códigos empaquetada.
+    
+    Los bits se acumulan en un entero y se vuelcan byte a byte a un bytearray;
+    el último byte se completa con ceros a la derecha.
     
-    return codigos
+    Args:
+        texto: Texto a codificar
+        codigos: Tabla de generar_codigos_empaquetados
+    
+    Returns:
+        Bytes del texto comprimido
+    
+    Complejidad: O(m) donde m = longitud del texto
+    """
+    salida = bytearray()
+    buffer = 0
+    nbits = 0
+    for caracter in texto:
+        bits, longitud = codigos[caracter]
+        buffer = (buffer << longitud) | bits
+        nbits += longitud
+        while nbits >= 8:
+            nbits -= 8
+            salida.append((buffer >> nbits) & 0xFF)
+        # Conservar solo los bits pendientes para que el buffer no crezca
+        buffer &= (1 << nbits) - 1
+    
+    if nbits:
+        salida.append((buffer << (8 - nbits)) & 0xFF)
+    return bytes(salida)
 
 
 def representacion_textual_arbol(raiz: Optional[NodoHuffman], prefijo: str = "", 
@@ -137,6 +246,9 @@ def representacion_textual_arbol(raiz: Optional[NodoHuffman], prefijo: str = "",
     """
     Genera representación textual del árbol de Huffman.
     
+    El recorrido es iterativo y las líneas se acumulan en una lista que se une
+    al final, evitando concatenaciones repetidas de strings.
+    
     Args:
         raiz: Raíz del árbol
         prefijo: Prefijo para la indentación
@@ -150,51 +262,80 @@ def representacion_textual_arbol(raiz: Optional[NodoHuffman], prefijo: str = "",
     if raiz is None:
         return ""
     
-    resultado = ""
-    
-    # Símbolo de conexión
-    conector = "├── " if es_izquierdo else "└── "
-    
-    # Representar nodo actual
-    if raiz.es_hoja():
-        char_repr = repr(raiz.caracter) if raiz.caracter != ' ' else "' '"
-        resultado += f"{prefijo}{conector}[{char_repr}: {raiz.frecuencia}]\n"
-    else:
-        resultado += f"{prefijo}{conector}[{raiz.frecuencia}]\n"
-    
-    # Actualizar prefijo para hijos
-    nuevo_prefijo = prefijo + ("│   " if es_izquierdo else "    ")
-    
-    # Recorrer hijos
-    if raiz.izquierdo:
-        resultado += representacion_textual_arbol(raiz.izquierdo, nuevo_prefijo, True)
-    if raiz.derecho:
-        resultado += representacion_textual_arbol(raiz.derecho, nuevo_prefijo, False)
+    partes = []
+    pila = [(raiz, prefijo, es_izquierdo)]
+    while pila:
+        nodo, prefijo_actual, izquierdo = pila.pop()
+        
+        # Símbolo de conexión
+        conector = "├── " if izquierdo else "└── "
+        
+        # Representar nodo actual
+        if nodo.es_hoja():
+            char_repr = repr(nodo.caracter) if nodo.caracter != ' ' else "' '"
+            partes.append(f"{prefijo_actual}{conector}[{char_repr}: {nodo.frecuencia}]\n")
+        else:
+            partes.append(f"{prefijo_actual}{conector}[{nodo.frecuencia}]\n")
+        
+        # Actualizar prefijo para hijos
+        nuevo_prefijo = prefijo_actual + ("│   " if izquierdo else "    ")
+        
+        # Apilar hijos (derecho primero para visitar el izquierdo antes)
+        if nodo.derecho:
+            pila.append((nodo.derecho, nuevo_prefijo, False))
+        if nodo.izquierdo:
+            pila.append((nodo.izquierdo, nuevo_prefijo, True))
     
-    return resultado
+    return "".join(partes)
 
 
-def visualizar_arbol_huffman(raiz: Optional[NodoHuffman], archivo_salida: str = "output/huffman_tree.png"):
+def visualizar_arbol_huffman(raiz: Optional[NodoHuffman], archivo_salida: str = "output/huffman_tree.png",
+                             dpi: int = 150, clave: Optional[str] = None):
     """
     Visualiza el árbol de Huffman usando NetworkX y Matplotlib.
     
     Args:
         raiz: Raíz del árbol de Huffman
         archivo_salida: Nombre del archivo PNG de salida
+        dpi: Resolución de la imagen de salida
+        clave: Huella del texto de entrada; si coincide con la del último
+               render, la imagen existente se reutiliza
     
     Complejidad: O(n) donde n = número de nodos
     """
     if raiz is None:
         return
     
+    clave = None if clave is None else f"{clave}:{dpi}"
+    if not requiere_render(archivo_salida, clave):
+        print(f"✓ Árbol sin cambios: {archivo_salida}")
+        return
+    
     G = nx.DiGraph()
     etiquetas = {}
-    contador = [0]  # Para IDs únicos de nodos
     
-    def agregar_nodos(nodo, id_nodo=0):
-        """Agrega nodos al grafo de forma recursiva."""
-        if nodo is None:
-            return
+    profundidad = {}
+    hijo_izquierdo = {}
+    hijo_derecho = {}
+    
+    # Recorrido en preorden con pila: (nodo, id del padre, etiqueta de la arista)
+    # Los ids se asignan en orden de visita
+    pila = [(raiz, None, None)]
+    siguiente_id = 0
+    while pila:
+        nodo, id_padre, bit = pila.pop()
+        id_nodo = siguiente_id
+        siguiente_id += 1
+        
+        if id_padre is None:
+            profundidad[id_nodo] = 0
+        else:
+            G.add_edge(id_padre, id_nodo, label=bit)
+            profundidad[id_nodo] = profundidad[id_padre] + 1
+            if bit == '0':
+                hijo_izquierdo[id_padre] = id_nodo
+            else:
+                hijo_derecho[id_padre] = id_nodo
         
         # Etiqueta del nodo
         if nodo.es_hoja():
@@ -203,60 +344,86 @@ def visualizar_arbol_huffman(raiz: Optional[NodoHuffman], archivo_salida: str =
         else:
             etiquetas[id_nodo] = str(nodo.frecuencia)
         
-        # Agregar hijos
-        if nodo.izquierdo:
-            contador[0] += 1
-            id_izq = contador[0]
-            G.add_edge(id_nodo, id_izq, label='0')
-            agregar_nodos(nodo.izquierdo, id_izq)
-        
+        # Apilar hijos (derecho primero para visitar el izquierdo antes)
         if nodo.derecho:
-            contador[0] += 1
-            id_der = contador[0]
-            G.add_edge(id_nodo, id_der, label='1')
-            agregar_nodos(nodo.derecho, id_der)
-    
-    agregar_nodos(raiz)
+            pila.append((nodo.derecho, id_nodo, '1'))
+        if nodo.izquierdo:
+            pila.append((nodo.izquierdo, id_nodo, '0'))
     
     # Crear visualización
     plt.figure(figsize=(14, 10))
-    
-    # Usar hierarchical_layout para árbol
-    pos = nx.spring_layout(G, k=3, iterations=50)
+    ax = plt.gca()
+    
+    # Layout jerárquico: x = posición en recorrido inorden, y = -profundidad
+    # Complejidad: O(n), frente a O(n² · iteraciones) de spring_layout
+    pos = {}
+    pila = []
+    actual = 0
+    orden = 0
+    while pila or actual is not None:
+        while actual is not None:
+            pila.append(actual)
+            actual = hijo_izquierdo.get(actual)
+        actual = pila.pop()
+        pos[actual] = (orden, -profundidad[actual])
+        orden += 1
+        actual = hijo_derecho.get(actual)
+    
+    # Cada grupo de elementos se dibuja como un único artista de Matplotlib
+    # Dibujar aristas (siempre de padre a hijo, hacia abajo)
+    segmentos = [(pos[u], pos[v]) for u, v in G.edges()]
+    ax.add_collection(LineCollection(segmentos, colors='gray', linewidths=2, zorder=1))
     
     # Dibujar nodos
-    nx.draw_networkx_nodes(G, pos, node_color='lightblue', 
-                           node_size=1500, edgecolors='black', linewidths=2)
-    
-    # Dibujar aristas
-    nx.draw_networkx_edges(G, pos, edge_color='gray', 
-                           width=2, arrowsize=20, arrowstyle='->')
+    nodos = list(G.nodes())
+    ax.scatter([pos[n][0] for n in nodos], [pos[n][1] for n in nodos], s=1500,
+               c='lightblue', edgecolors='black', linewidths=2, zorder=2)
     
     # Dibujar etiquetas de nodos
-    nx.draw_networkx_labels(G, pos, etiquetas, font_size=10, font_weight='bold')
+    for nodo in nodos:
+        x, y = pos[nodo]
+        ax.text(x, y, etiquetas[nodo], fontsize=10, fontweight='bold',
+                ha='center', va='center', zorder=3)
+    
+    # Dibujar etiquetas de aristas en el punto medio de cada arista
+    for u, v, bit in G.edges(data='label'):
+        (x1, y1), (x2, y2) = pos[u], pos[v]
+        ax.text((x1 + x2) / 2, (y1 + y2) / 2, bit, fontsize=9, color='red',
+                ha='center', va='center', zorder=3,
+                bbox=dict(boxstyle='round', ec='white', fc='white'))
     
-    # Dibujar etiquetas de aristas
-    edge_labels = nx.get_edge_attributes(G, 'label')
-    nx.draw_networkx_edge_labels(G, pos, edge_labels, font_size=9, font_color='red')
+    ax.autoscale_view()
+    ax.margins(0.05)
     
     plt.title("Árbol de Huffman", fontsize=16, fontweight='bold')
     plt.axis('off')
-    plt.tight_layout()
-    plt.savefig(archivo_salida, dpi=300, bbox_inches='tight', facecolor='white')
+    # Márgenes fijos: bbox_inches='tight' renderiza la figura una vez más
+    plt.subplots_adjust(left=0.02, right=0.98, bottom=0.02, top=0.94)
+    plt.savefig(archivo_salida, dpi=dpi, facecolor='white')
     plt.close()
+    registrar_render(archivo_salida, clave)
     print(f"✓ Árbol guardado: {archivo_salida}")
 
 
-def visualizar_frecuencias(frecuencias: Dict[str, int], archivo_salida: str = "output/huffman_freq.png"):
+def visualizar_frecuencias(frecuencias: Dict[str, int], archivo_salida: str = "output/huffman_freq.png",
+                           dpi: int = 150, clave: Optional[str] = None):
     """
     Visualiza las frecuencias de caracteres en un gráfico de barras.
     
     Args:
         frecuencias: Diccionario con frecuencias de caracteres
         archivo_salida: Nombre del archivo PNG de salida
+        dpi: Resolución de la imagen de salida
+        clave: Huella del texto de entrada; si coincide con la del último
+               render, la imagen existente se reutiliza
     
     Complejidad: O(n log n) por el ordenamiento
     """
+    clave = None if clave is None else f"{clave}:{dpi}"
+    if not requiere_render(archivo_salida, clave):
+        print(f"✓ Frecuencias sin cambios: {archivo_salida}")
+        return
+    
     # Ordenar por frecuencia descendente
     items = sorted(frecuencias.items(), key=lambda x: x[1], reverse=True)
     caracteres = [repr(char) if char != ' ' else "' '" for char, _ in items]
@@ -277,9 +444,10 @@ def visualizar_frecuencias(frecuencias: Dict[str, int], archivo_salida: str = "o
     plt.title('Frecuencia de Caracteres', fontsize=14, fontweight='bold')
     plt.xticks(range(len(caracteres)), caracteres, rotation=45, ha='right')
     plt.grid(axis='y', alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(archivo_salida, dpi=300, bbox_inches='tight', facecolor='white')
+    plt.subplots_adjust(left=0.08, right=0.98, bottom=0.15, top=0.92)
+    plt.savefig(archivo_salida, dpi=dpi, facecolor='white')
     plt.close()
+    registrar_render(archivo_salida, clave)
     print(f"✓ Frecuencias guardadas: {archivo_salida}")
 
 
@@ -313,7 +481,7 @@ def ejecutar_huffman(archivo_txt: str = "data/texto.txt"):
     print(f"✓ Caracteres únicos: {len(frecuencias)}")
     
     # Construir árbol de Huffman
-    raiz = construir_arbol_huffman(frecuencias)
+    raiz, bits_comprimido = construir_arbol_huffman(frecuencias)
     
     # Generar códigos
     codigos = generar_codigos(raiz)
@@ -333,7 +501,6 @@ def ejecutar_huffman(archivo_txt: str = "data/texto.txt"):
     
     # Calcular tamaño original vs comprimido
     bits_original = len(texto) * 8
-    bits_comprimido = sum(len(codigos[char]) * freq for char, freq in frecuencias.items())
     tasa_compresion = (1 - bits_comprimido / bits_original) * 100
     
     print(f"\n Estadísticas de Compresión:")
@@ -342,8 +509,10 @@ def ejecutar_huffman(archivo_txt: str = "data/texto.txt"):
     print(f"   Tasa de compresión: {tasa_compresion:.2f}%")
     
     # Generar visualizaciones
-    visualizar_arbol_huffman(raiz)
-    visualizar_frecuencias(frecuencias)
+    # Las imágenes solo se regeneran si el texto cambió desde el último render
+    clave = calcular_clave(texto.encode('utf-8'))
+    visualizar_arbol_huffman(raiz, clave=clave)
+    visualizar_frecuencias(frecuencias, clave=clave)
     
     print(f"\n✓ Proceso completado exitosamente")
     print("="*60 + "\n")
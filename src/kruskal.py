@@ -7,8 +7,15 @@ y agregándolas si no forman ciclos, usando Union-Find para detección de ciclos
 Complejidad: O(E log E) donde E = número de aristas
 """
 
-from typing import List, Tuple, Dict
-from src.graph_utils import leer_grafo_csv, crear_grafo_networkx, visualizar_grafo
+import numpy as np
+from typing import List, Tuple, Union
+from src.graph_utils import (EdgeArrays, aristas_a_arrays, codificar_aristas, leer_edge_arrays_cacheado,
+                             visualizar_grafo_en_segundo_plano, calcular_clave)
+
+try:
+    from src._kruskal_numba import _filtrar_paralelo, _kruskal_core
+except ImportError:  # Numba es opcional: se usa el bucle en Python puro
+    _kruskal_core = None
 
 
 class UnionFind:
@@ -16,113 +23,284 @@ class UnionFind:
     Estructura de datos Union-Find (Disjoint Set Union) con compresión de ruta.
     
     Utilizada para detectar ciclos eficientemente en el algoritmo de Kruskal.
+    Los nodos se identifican con enteros 0..n-1 y padre/rango se guardan en
+    listas indexadas por id en lugar de diccionarios por nombre. Son listas y
+    no arrays de NumPy porque se acceden elemento a elemento desde Python, y
+    cada acceso a un array crearía un escalar de NumPy (el kernel de Numba sí
+    usa arrays).
     
     Complejidad: O(α(n)) por operación, donde α es la inversa de Ackermann (casi constante)
     """
     
-    def __init__(self, nodos: List[str]):
+    def __init__(self, n: int):
         """
         Inicializa Union-Find con cada nodo en su propio conjunto.
         
         Args:
-            nodos: Lista de nodos del grafo
+            n: Número de nodos (ids 0..n-1)
         
         Complejidad: O(V) donde V = número de vértices
         """
-        self.padre: Dict[str, str] = {nodo: nodo for nodo in nodos}
-        self.rango: Dict[str, int] = {nodo: 0 for nodo in nodos}
+        self.padre: List[int] = list(range(n))
+        self.rango: List[int] = [0] * n
     
-    def encontrar(self, nodo: str) -> str:
+    def encontrar(self, nodo: int) -> int:
         """
         Encuentra el representante del conjunto con compresión de ruta.
         
+        Versión iterativa en dos pasadas: primero sube hasta la raíz y luego
+        enlaza directamente a la raíz cada nodo del camino.
+        
         Args:
-            nodo: Nodo a buscar
+            nodo: Id del nodo a buscar
         
         Returns:
-            Representante del conjunto
+            Id del representante del conjunto
         
         Complejidad: O(α(n)) amortizado
         """
-        if self.padre[nodo] != nodo:
-            self.padre[nodo] = self.encontrar(self.padre[nodo])  # Compresión de ruta
-        return self.padre[nodo]
+        p = self.padre
+        raiz = nodo
+        while p[raiz] != raiz:
+            raiz = p[raiz]
+        
+        # Compresión de ruta
+        while p[nodo] != raiz:
+            siguiente = p[nodo]
+            p[nodo] = raiz
+            nodo = siguiente
+        return raiz
     
-    def unir(self, nodo1: str, nodo2: str) -> bool:
+    def unir(self, nodo1: int, nodo2: int) -> bool:
         """
         Une dos conjuntos usando unión por rango.
         
         Args:
-            nodo1: Primer nodo
-            nodo2: Segundo nodo
+            nodo1: Id del primer nodo
+            nodo2: Id del segundo nodo
         
         Returns:
             True si se unieron (estaban en conjuntos diferentes), False si ya estaban unidos
         
         Complejidad: O(α(n)) amortizado
         """
-        raiz1 = self.encontrar(nodo1)
-        raiz2 = self.encontrar(nodo2)
+        encontrar = self.encontrar
+        raiz1 = encontrar(nodo1)
+        raiz2 = encontrar(nodo2)
         
         if raiz1 == raiz2:
             return False  # Ya están en el mismo conjunto (formarían ciclo)
         
-        # Unión por rango
-        if self.rango[raiz1] < self.rango[raiz2]:
-            self.padre[raiz1] = raiz2
-        elif self.rango[raiz1] > self.rango[raiz2]:
-            self.padre[raiz2] = raiz1
+        # Unión por rango (atributos y rangos leídos una sola vez)
+        p, r = self.padre, self.rango
+        rango1, rango2 = r[raiz1], r[raiz2]
+        if rango1 < rango2:
+            p[raiz1] = raiz2
+        elif rango1 > rango2:
+            p[raiz2] = raiz1
         else:
-            self.padre[raiz2] = raiz1
-            self.rango[raiz1] += 1
+            p[raiz2] = raiz1
+            r[raiz1] = rango1 + 1
         
         return True
 
 
-def kruskal(aristas: List[Tuple[str, str, int]]) -> Tuple[List[Tuple], int]:
+try:
+    # Versión compilada con Cython (python setup.py build_ext --inplace)
+    from src._unionfind import UnionFindC as UnionFind
+except ImportError:  # Extensión no compilada: se usa la clase en Python
+    pass
+
+
+def _ordenar_por_peso(w: np.ndarray) -> np.ndarray:
+    """
+    Calcula el orden estable de las aristas por peso.
+    
+    Si el rango de pesos es pequeño respecto al número de aristas, los pesos
+    se desplazan a claves de 16 bits, para las que NumPy usa radix sort
+    (ordenamiento por conteo) en O(E). En otro caso se usa argsort estable.
+    
+    Args:
+        w: Array de pesos
+    
+    Returns:
+        Array de índices de las aristas ordenadas por peso
+    
+    Complejidad: O(E) con rango pequeño, O(E log E) en otro caso
+    """
+    if len(w) == 0:
+        return np.empty(0, dtype=np.intp)
+    
+    minimo = int(w.min())
+    rango = int(w.max()) - minimo
+    if rango < 4 * len(w) and rango <= np.iinfo(np.uint16).max:
+        # Con pesos int16 la resta puede desbordar, pero el resultado módulo 2^16
+        # es exactamente la clave en [0, rango] al reinterpretarlo como uint16
+        return np.argsort((w - minimo).astype(np.uint16), kind='stable')
+    return np.argsort(w, kind='stable')
+
+
+def _separar_livianas(w: np.ndarray, pendientes: np.ndarray,
+                      k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Separa las k aristas pendientes más livianas (con sus empates) del resto.
+    
+    Todas las aristas del lote pesan a lo sumo lo mismo que cualquiera del
+    resto y ambos conservan el orden original de índices, así que ordenar el
+    lote de forma estable da el mismo orden que ordenar todas las aristas.
+    
+    Args:
+        w: Pesos de todas las aristas
+        pendientes: Índices (crecientes) de las aristas aún no procesadas
+        k: Tamaño mínimo del lote
+    
+    Returns:
+        Tupla con (índices del lote, índices restantes)
+    
+    Complejidad: O(len(pendientes))
+    """
+    if k >= len(pendientes):
+        return pendientes, pendientes[:0]
+    
+    pesos = w[pendientes]
+    umbral = np.partition(pesos, k - 1)[k - 1]
+    livianas = pesos <= umbral
+    return pendientes[livianas], pendientes[~livianas]
+
+
+def kruskal(aristas: Union[List[Tuple[str, str, int]], EdgeArrays]) -> Tuple[List[Tuple], int]:
     """
     Implementa el algoritmo de Kruskal para encontrar el MST.
     
     Args:
-        aristas: Lista de tuplas (nodo1, nodo2, peso)
+        aristas: Lista de tuplas (nodo1, nodo2, peso) o EdgeArrays
     
     Returns:
         Tupla con (lista de aristas del MST, peso total del MST)
     
     Complejidad: O(E log E) dominado por el ordenamiento
     """
+    if isinstance(aristas, EdgeArrays):
+        return _kruskal_ids(aristas.src, aristas.dst, aristas.w, aristas.node_names.tolist())
     if not aristas:
         return [], 0
+    return kruskal_arrays(*aristas_a_arrays(aristas))
+
+
+def kruskal_arrays(n1: np.ndarray, n2: np.ndarray, w: np.ndarray) -> Tuple[List[Tuple], int]:
+    """
+    Implementa el algoritmo de Kruskal sobre aristas en arrays paralelos.
+    
+    Args:
+        n1: Nombres del primer extremo de cada arista
+        n2: Nombres del segundo extremo de cada arista
+        w: Pesos de las aristas (enteros)
+    
+    Returns:
+        Tupla con (lista de aristas del MST, peso total del MST)
+    
+    Complejidad: O(E log E) dominado por el ordenamiento
+    """
+    E = len(w)
+    if E == 0:
+        return [], 0
+    
+    # Codificar los nodos como ids contiguos en orden de aparición: pd.factorize
+    # o, sin pandas, np.unique sobre los nombres como cadenas de ancho fijo
+    # Complejidad: O(E) con pandas, O(E log E) sin pandas
+    aristas = codificar_aristas(n1, n2, w)
+    return _kruskal_ids(aristas.src, aristas.dst, aristas.w, aristas.node_names.tolist())
+
+
+def _kruskal_ids(u: np.ndarray, v: np.ndarray, w: np.ndarray,
+                 nodos: List[str]) -> Tuple[List[Tuple], int]:
+    """
+    Núcleo de Kruskal sobre aristas con nodos codificados como enteros.
+    
+    Union-Find trabaja sobre arrays de ids; los nombres solo se recuperan al
+    emitir las aristas del MST. Si Numba está instalado, el bucle principal
+    corre en _kruskal_core.
+    
+    Args:
+        u: Id del primer extremo de cada arista
+        v: Id del segundo extremo de cada arista
+        w: Pesos de las aristas (enteros)
+        nodos: Nombre de cada nodo por id
+    
+    Returns:
+        Tupla con (lista de aristas del MST, peso total del MST)
     
-    # Obtener todos los nodos únicos
-    # Complejidad: O(E)
-    nodos = set()
-    for nodo1, nodo2, _ in aristas:
-        nodos.add(nodo1)
-        nodos.add(nodo2)
+    Complejidad: O(E + k log E), donde k es el número de aristas revisadas
+    antes de completar el MST
+    """
+    V = len(nodos)
+    E = len(w)
+    if E == 0 or V < 2:
+        return [], 0
     
-    # Ordenar aristas por peso
-    # Complejidad: O(E log E)
-    aristas_ordenadas = sorted(aristas, key=lambda x: x[2])
+    # Con Numba, todo el bucle de Union-Find corre en el kernel compilado. Las
+    # aristas se ordenan por lotes de las k más livianas (k se duplica en cada
+    # ronda), así el ordenamiento se detiene cuando el MST ya está completo
+    if _kruskal_core is not None:
+        padre = np.arange(V, dtype=np.int32)
+        rango = np.zeros(V, dtype=np.int8)
+        seleccionadas: List[np.ndarray] = []
+        peso_total = 0
+        faltan = V - 1
+        
+        pendientes = np.arange(E)
+        k = 2 * V
+        while faltan > 0 and len(pendientes) > 0:
+            lote, pendientes = _separar_livianas(w, pendientes, k)
+            orden = lote[_ordenar_por_peso(w[lote])]
+            # Lotes grandes: filtrado en paralelo por bloques antes del Union-Find global
+            orden = _filtrar_paralelo(u, v, orden, V)
+            cantidad, peso_lote, indices_mst = _kruskal_core(u, v, w, orden, padre, rango, faltan)
+            seleccionadas.append(indices_mst[:cantidad])
+            peso_total += int(peso_lote)
+            faltan -= cantidad
+            k *= 2
+        
+        indices_mst = np.concatenate(seleccionadas).tolist()
+        mst_aristas = [(nodos[u[e]], nodos[v[e]], int(w[e])) for e in indices_mst]
+        return mst_aristas, peso_total
     
     # Inicializar Union-Find
-    uf = UnionFind(list(nodos))
+    uf = UnionFind(V)
     
-    mst_aristas: List[Tuple[str, str, int]] = []
+    # El MST tiene exactamente V-1 aristas si el grafo es conexo
+    mst_aristas: List[Tuple[str, str, int]] = [None] * (V - 1)
+    num_aristas = 0
     peso_total = 0
     
+    # Mismos lotes que en el camino con Numba: cada lote se ordena en NumPy
+    # (radix sort si el rango de pesos es pequeño) y se recorre como lista de
+    # Python, sin un heappop por arista
+    ids1, ids2, pesos = u.tolist(), v.tolist(), w.tolist()
+    unir = uf.unir
+    pendientes = np.arange(E)
+    k = 2 * V
+    
     # Procesar aristas en orden de peso
-    # Complejidad: O(E * α(V))
-    for nodo1, nodo2, peso in aristas_ordenadas:
-        # Si unir estos nodos no forma ciclo, agregar al MST
-        if uf.unir(nodo1, nodo2):
-            mst_aristas.append((nodo1, nodo2, peso))
-            peso_total += peso
-            
-            # Si ya tenemos V-1 aristas, terminamos
-            if len(mst_aristas) == len(nodos) - 1:
-                break
+    # Complejidad: O(k * α(V)) más el ordenamiento de los lotes revisados
+    while num_aristas < V - 1 and len(pendientes) > 0:
+        lote, pendientes = _separar_livianas(w, pendientes, k)
+        for e in lote[_ordenar_por_peso(w[lote])].tolist():
+            id1, id2 = ids1[e], ids2[e]
+            # Si unir estos nodos no forma ciclo, agregar al MST
+            if unir(id1, id2):
+                peso = pesos[e]
+                mst_aristas[num_aristas] = (nodos[id1], nodos[id2], peso)
+                num_aristas += 1
+                peso_total += peso
+                
+                # Si ya tenemos V-1 aristas, terminamos
+                if num_aristas == V - 1:
+                    break
+        k *= 2
     
+    # Grafo no conexo: bosque con menos de V-1 aristas
+    del mst_aristas[num_aristas:]
     return mst_aristas, peso_total
 
 
@@ -130,6 +308,10 @@ def ejecutar_kruskal(archivo_csv: str = "data/grafo.csv"):
     """
     Ejecuta el algoritmo de Kruskal completo y genera la visualización.
     
+    La imagen se dibuja en un proceso de fondo: la función vuelve sin esperarla,
+    así que "✓ Imagen guardada" puede mostrarse después del resumen. Un error
+    al dibujar se informa en la siguiente visualización o al salir.
+    
     Args:
         archivo_csv: Ruta al archivo CSV con el grafo
     
@@ -139,9 +321,10 @@ def ejecutar_kruskal(archivo_csv: str = "data/grafo.csv"):
     print("ALGORITMO DE KRUSKAL - ÁRBOL DE EXPANSIÓN MÍNIMA")
     print("="*60)
     
-    # Leer grafo
-    aristas = leer_grafo_csv(archivo_csv)
-    if not aristas:
+    # Leer grafo ya codificado (la lectura se reutiliza entre ejecuciones):
+    # las mismas aristas las usan Kruskal y la visualización
+    aristas = leer_edge_arrays_cacheado(archivo_csv)
+    if len(aristas.w) == 0:
         return
     
     # Ejecutar Kruskal
@@ -155,12 +338,12 @@ def ejecutar_kruskal(archivo_csv: str = "data/grafo.csv"):
     for nodo1, nodo2, peso in mst_aristas:
         print(f"   {nodo1} -- {nodo2} : {peso}")
     
-    # Crear visualización
-    G = crear_grafo_networkx(aristas)
+    # Crear visualización en segundo plano: los resultados ya se mostraron
     aristas_mst = [(n1, n2) for n1, n2, _ in mst_aristas]
-    visualizar_grafo(G, aristas_mst, 
-                     titulo=f"Algoritmo de Kruskal - MST (Peso Total: {peso_total})",
-                     archivo_salida="output/kruskal_mst.png")
+    visualizar_grafo_en_segundo_plano(aristas, aristas_mst,
+                                      titulo=f"Algoritmo de Kruskal - MST (Peso Total: {peso_total})",
+                                      archivo_salida="output/kruskal_mst.png",
+                                      clave=calcular_clave(*aristas))
     
     print(f"\n✓ Proceso completado exitosamente")
     print("="*60 + "\n")
@@ -7,17 +7,40 @@ que conectan el árbol en construcción con vértices no visitados.
 Complejidad: O(E log V) con heap binario, donde E = aristas, V = vértices
 """
 
+import functools
 import heapq
-from typing import List, Tuple, Dict, Set
-from src.graph_utils import leer_grafo_csv, crear_grafo_networkx, visualizar_grafo
+import os
+import numpy as np
+from typing import Dict, List, Optional, Tuple, Union
+from src.graph_utils import (EdgeArrays, GrafoCSR, aristas_a_arrays, construir_csr_desde_arrays,
+                             csr_desde_edge_arrays, leer_edge_arrays_cacheado,
+                             visualizar_grafo_en_segundo_plano, calcular_clave)
 
+# Bits bajos de una clave del heap: id del nodo destino
+_MASCARA_NODO = 0xFFFFFFFF
 
-def prim(aristas: List[Tuple[str, str, int]], nodo_inicial: str = None) -> Tuple[List[Tuple], int]:
+# A partir de este número de nodos conviene reordenar el grafo con RCM
+_UMBRAL_REORDENAR = 10_000
+
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import reverse_cuthill_mckee
+except ImportError:  # scipy es opcional: se omite el reordenamiento
+    reverse_cuthill_mckee = None
+
+try:
+    from src._prim_numba import _prim_core
+except ImportError:  # Numba es opcional: se usa heapq en Python puro
+    _prim_core = None
+
+
+def prim(aristas: Union[List[Tuple[str, str, int]], EdgeArrays],
+         nodo_inicial: str = None) -> Tuple[List[Tuple], int]:
     """
     Implementa el algoritmo de Prim para encontrar el MST.
     
     Args:
-        aristas: Lista de tuplas (nodo1, nodo2, peso)
+        aristas: Lista de tuplas (nodo1, nodo2, peso) o EdgeArrays
         nodo_inicial: Nodo desde donde iniciar (opcional)
     
     Returns:
@@ -25,60 +48,219 @@ def prim(aristas: List[Tuple[str, str, int]], nodo_inicial: str = None) -> Tuple
     
     Complejidad: O(E log V) usando heap binario
     """
+    if isinstance(aristas, EdgeArrays):
+        if len(aristas.w) == 0:
+            return [], 0
+        return _prim_csr(*csr_desde_edge_arrays(aristas), nodo_inicial=nodo_inicial)
     if not aristas:
         return [], 0
+    return prim_arrays(*aristas_a_arrays(aristas), nodo_inicial=nodo_inicial)
+
+
+def prim_arrays(n1: np.ndarray, n2: np.ndarray, w: np.ndarray,
+                nodo_inicial: str = None) -> Tuple[List[Tuple], int]:
+    """
+    Implementa el algoritmo de Prim sobre aristas en arrays paralelos.
+    
+    Args:
+        n1: Nombres del primer extremo de cada arista
+        n2: Nombres del segundo extremo de cada arista
+        w: Pesos de las aristas (enteros)
+        nodo_inicial: Nodo desde donde iniciar (opcional, por defecto el primero)
+    
+    Returns:
+        Tupla con (lista de aristas del MST, peso total del MST)
+    
+    Complejidad: O(E log V) usando heap binario
+    """
+    if len(w) == 0:
+        return [], 0
+    
+    # Construir representación CSR: los vecinos de u quedan contiguos en
+    # indices[indptr[u]:indptr[u+1]] con sus pesos en weights
+    # Complejidad: O(V + E log E)
+    return _prim_csr(*construir_csr_desde_arrays(n1, n2, w), nodo_inicial=nodo_inicial)
+
+
+def _reordenar_rcm(label_of: List[str], indptr: np.ndarray, indices: np.ndarray,
+                   weights: np.ndarray) -> GrafoCSR:
+    """
+    Renumera los nodos con Reverse Cuthill-McKee y reconstruye el CSR.
+    
+    RCM deja a los vecinos de cada nodo en ids cercanos, de modo que las
+    consultas a visitados/mejor durante el recorrido caen en las mismas líneas
+    de caché. Las aristas paralelas se conservan tal cual.
+    
+    Args:
+        label_of: Nombre de cada nodo por id
+        indptr: Punteros de inicio de cada fila CSR
+        indices: Destinos de las aristas CSR
+        weights: Pesos de las aristas CSR
+    
+    Returns:
+        GrafoCSR con la nueva numeración
+    
+    Complejidad: O(V + E) más el costo de RCM
+    """
+    V = len(label_of)
+    adyacencia = csr_matrix((weights, indices, indptr), shape=(V, V))
+    perm = reverse_cuthill_mckee(adyacencia, symmetric_mode=True)  # perm[nuevo] = viejo
+    nuevo_id = np.empty(V, dtype=np.int32)
+    nuevo_id[perm] = np.arange(V, dtype=np.int32)
+    
+    # Copiar las filas en el orden de perm: cada posición nueva apunta a la vieja
+    grados = np.diff(indptr)[perm]
+    nuevo_indptr = np.zeros(V + 1, dtype=indptr.dtype)
+    np.cumsum(grados, out=nuevo_indptr[1:])
+    desplazamiento = np.repeat(indptr[perm] - nuevo_indptr[:-1], grados)
+    posiciones = np.arange(len(indices)) + desplazamiento
+    
+    nuevos_nombres = [label_of[viejo] for viejo in perm.tolist()]
+    return GrafoCSR(nuevos_nombres, nuevo_indptr, nuevo_id[indices[posiciones]], weights[posiciones])
+
+
+def _prim_csr(label_of: List[str], indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray,
+              nodo_inicial: str = None, id_of: Optional[Dict[str, int]] = None) -> Tuple[List[Tuple], int]:
+    """
+    Núcleo de Prim sobre el grafo en formato CSR.
+    
+    Los nodos son enteros y el heap solo compara enteros. Si Numba está
+    instalado, el recorrido corre en _prim_core con un heap 4-ario de arrays.
     
-    # Construir lista de adyacencia
-    # Complejidad: O(E)
-    grafo: Dict[str, List[Tuple[str, int]]] = {}
-    for nodo1, nodo2, peso in aristas:
-        if nodo1 not in grafo:
-            grafo[nodo1] = []
-        if nodo2 not in grafo:
-            grafo[nodo2] = []
-        grafo[nodo1].append((nodo2, peso))
-        grafo[nodo2].append((nodo1, peso))
+    Args:
+        label_of: Nombre de cada nodo por id
+        indptr: Punteros de inicio de cada fila CSR
+        indices: Destinos de las aristas CSR
+        weights: Pesos de las aristas CSR
+        nodo_inicial: Nodo desde donde iniciar (opcional, por defecto el id 0)
+        id_of: Mapa nodo -> id (se calcula a partir de label_of si no se indica)
+    
+    Returns:
+        Tupla con (lista de aristas del MST, peso total del MST); vacía si el
+        nodo inicial no existe
+    
+    Complejidad: O(E log V) usando heap binario
+    """
+    V = len(label_of)
     
     # Inicializar
     if nodo_inicial is None:
-        nodo_inicial = list(grafo.keys())[0]
+        inicio = 0
+    else:
+        if id_of is None:
+            id_of = {nodo: i for i, nodo in enumerate(label_of)}
+        if nodo_inicial not in id_of:
+            print(f"✗ Error: El nodo '{nodo_inicial}' no existe en el grafo")
+            return [], 0
+        inicio = id_of[nodo_inicial]
+    
+    if _prim_core is not None:
+        cantidad, orden, pred, mejor = _prim_core(indptr, indices, weights, inicio, V)
+        orden = orden[:cantidad]
+        mst_aristas = [(label_of[p], label_of[u], w) for u, p, w in
+                       zip(orden.tolist(), pred[orden].tolist(), mejor[orden].tolist())]
+        return mst_aristas, int(mejor[orden].sum())
+    
+    # Recorrer listas de Python evita crear un escalar de NumPy por vecino
+    indptr = indptr.tolist()
+    indices = indices.tolist()
+    weights = weights.tolist()
     
-    visitados: Set[str] = {nodo_inicial}
-    mst_aristas: List[Tuple[str, str, int]] = []
+    visitados: List[bool] = [False] * V
+    visitados[inicio] = True
+    
+    # El MST tiene exactamente V-1 aristas si el grafo es conexo
+    mst_aristas: List[Tuple[str, str, int]] = [None] * (V - 1)
+    num_aristas = 0
     peso_total = 0
     
-    # Heap con aristas candidatas: (peso, nodo1, nodo2)
-    # Complejidad de heappush/heappop: O(log E)
-    heap = []
-    for vecino, peso in grafo[nodo_inicial]:
-        heapq.heappush(heap, (peso, nodo_inicial, vecino))
+    # Mejor peso conocido para llegar a cada nodo: solo se inserta en el heap
+    # una arista que lo mejora, así el heap queda en O(V) en el caso común
+    mejor: List[float] = [float('inf')] * V
+    
+    # Nodo del árbol desde el que se llega a cada nodo con peso mejor[nodo]
+    pred: List[int] = [-1] * V
+    
+    # Heap de enteros empaquetados (peso << 32) | destino: se compara un solo
+    # entero en C en lugar de una tupla, y el origen se recupera de pred
+    # Complejidad de heappush/heappop: O(log V)
+    heap: List[int] = []
+    for k in range(indptr[inicio], indptr[inicio + 1]):
+        vecino = indices[k]
+        if weights[k] < mejor[vecino]:
+            mejor[vecino] = weights[k]
+            pred[vecino] = inicio
+            heapq.heappush(heap, (weights[k] << 32) | vecino)
     
     # Mientras haya aristas candidatas
     # Complejidad total del bucle: O(E log E) = O(E log V)
-    while heap and len(visitados) < len(grafo):
-        peso, nodo1, nodo2 = heapq.heappop(heap)
+    while heap:
+        clave = heapq.heappop(heap)
+        v2 = clave & _MASCARA_NODO
         
-        # Si el nodo destino ya fue visitado, saltar
-        if nodo2 in visitados:
+        # Si el nodo destino ya fue visitado, saltar (entrada superada por una mejora)
+        if visitados[v2]:
             continue
         
         # Agregar arista al MST
-        visitados.add(nodo2)
-        mst_aristas.append((nodo1, nodo2, peso))
+        peso = clave >> 32
+        visitados[v2] = True
+        mst_aristas[num_aristas] = (label_of[pred[v2]], label_of[v2], peso)
+        num_aristas += 1
         peso_total += peso
         
+        # Si ya tenemos V-1 aristas, el MST está completo
+        if num_aristas == V - 1:
+            break
+        
         # Agregar nuevas aristas candidatas
-        for vecino, peso_arista in grafo[nodo2]:
-            if vecino not in visitados:
-                heapq.heappush(heap, (peso_arista, nodo2, vecino))
+        for k in range(indptr[v2], indptr[v2 + 1]):
+            vecino = indices[k]
+            if not visitados[vecino] and weights[k] < mejor[vecino]:
+                mejor[vecino] = weights[k]
+                pred[vecino] = v2
+                heapq.heappush(heap, (weights[k] << 32) | vecino)
     
+    # Grafo no conexo: solo se cubre la componente del nodo inicial
+    del mst_aristas[num_aristas:]
     return mst_aristas, peso_total
 
 
+@functools.lru_cache(maxsize=8)
+def _csr_prim_cacheado(archivo_csv: str, mtime: float) -> Tuple[Dict[str, int], GrafoCSR]:
+    """
+    Construye (una vez por versión del archivo) la representación CSR para Prim.
+    
+    En grafos grandes los nodos se renumeran con RCM. Reordenar cuesta más que
+    lo que ahorra en un solo recorrido, por eso se hace aquí y no en prim():
+    las ejecuciones siguientes sobre el mismo archivo reutilizan el resultado.
+    Los arrays se marcan como de solo lectura porque se comparten entre llamadas.
+    
+    Args:
+        archivo_csv: Ruta al archivo CSV con el grafo
+        mtime: Fecha de modificación del archivo (parte de la clave de caché)
+    
+    Returns:
+        Tupla con (id_of, GrafoCSR) en la numeración final de los nodos
+    
+    Complejidad: O(V + E log E) la primera vez, O(1) en las siguientes
+    """
+    csr = csr_desde_edge_arrays(leer_edge_arrays_cacheado(archivo_csv))
+    if len(csr[0]) > _UMBRAL_REORDENAR and reverse_cuthill_mckee is not None:
+        csr = _reordenar_rcm(*csr)
+    for array in csr[1:]:
+        array.flags.writeable = False
+    return {nodo: i for i, nodo in enumerate(csr.label_of)}, csr
+
+
 def ejecutar_prim(archivo_csv: str = "data/grafo.csv"):
     """
     Ejecuta el algoritmo de Prim completo y genera la visualización.
     
+    La imagen se dibuja en un proceso de fondo: la función vuelve sin esperarla,
+    así que "✓ Imagen guardada" puede mostrarse después del resumen. Un error
+    al dibujar se informa en la siguiente visualización o al salir.
+    
     Args:
         archivo_csv: Ruta al archivo CSV con el grafo
     
@@ -88,13 +270,15 @@ def ejecutar_prim(archivo_csv: str = "data/grafo.csv"):
     print("ALGORITMO DE PRIM - ÁRBOL DE EXPANSIÓN MÍNIMA")
     print("="*60)
     
-    # Leer grafo
-    aristas = leer_grafo_csv(archivo_csv)
-    if not aristas:
+    # Leer grafo ya codificado (las lecturas y la CSR se reutilizan entre ejecuciones)
+    aristas = leer_edge_arrays_cacheado(archivo_csv)
+    if len(aristas.w) == 0:
         return
+    id_of, csr = _csr_prim_cacheado(archivo_csv, os.path.getmtime(archivo_csv))
     
-    # Ejecutar Prim
-    mst_aristas, peso_total = prim(aristas)
+    # Ejecutar Prim desde el primer nodo del archivo, como prim(): los nodos
+    # se numeran en orden de aparición, así que es el de id 0
+    mst_aristas, peso_total = _prim_csr(*csr, nodo_inicial=aristas.node_names[0], id_of=id_of)
     
     # Mostrar resultados
     print(f"\n Resultados del MST (Prim):")
@@ -104,12 +288,13 @@ def ejecutar_prim(archivo_csv: str = "data/grafo.csv"):
     for nodo1, nodo2, peso in mst_aristas:
         print(f"   {nodo1} -- {nodo2} : {peso}")
     
-    # Crear visualización
-    G = crear_grafo_networkx(aristas)
+    # Crear visualización en segundo plano: los resultados ya se mostraron
     aristas_mst = [(n1, n2) for n1, n2, _ in mst_aristas]
-    visualizar_grafo(G, aristas_mst, 
-                     titulo=f"Algoritmo de Prim - MST (Peso Total: {peso_total})",
-                     archivo_salida="output/prim_mst.png")
+    # La CSR ya construida se comparte con la visualización
+    visualizar_grafo_en_segundo_plano(csr, aristas_mst,
+                                      titulo=f"Algoritmo de Prim - MST (Peso Total: {peso_total})",
+                                      archivo_salida="output/prim_mst.png",
+                                      clave=calcular_clave(*aristas))
     
     print(f"\n✓ Proceso completado exitosamente")
     print("="*60 + "\n")
@@ -0,0 +1,41 @@
+"""
+Pruebas del algoritmo de Dijkstra.
+
+Se ejecutan con: python -m unittest discover tests
+"""
+
+import unittest
+from unittest import mock
+
+from src import dijkstra as modulo
+from src.dijkstra import dijkstra, dijkstra_delta_stepping
+
+
+class TestPesosNegativos(unittest.TestCase):
+    """Una arista negativa no dirigida forma un ciclo negativo: el recorrido debe terminar."""
+    
+    ARISTAS = [('A', 'B', -1), ('B', 'C', 2)]
+    ESPERADO = {'A': 0, 'B': -1, 'C': 1}
+    
+    def test_kernel_por_defecto(self):
+        distancias, predecesores = dijkstra(self.ARISTAS, 'A')
+        self.assertEqual(distancias, self.ESPERADO)
+        self.assertEqual(predecesores, {'B': 'A', 'C': 'B'})
+    
+    def test_kernel_sin_numba(self):
+        with mock.patch.object(modulo, 'NUMBA_DISPONIBLE', False):
+            distancias, _ = dijkstra(self.ARISTAS, 'A')
+        self.assertEqual(distancias, self.ESPERADO)
+    
+    def test_kernel_vectorizado(self):
+        with mock.patch.object(modulo, 'NUMBA_DISPONIBLE', False), \
+                mock.patch.object(modulo, '_UMBRAL_GRADO_VECTORIZADO', 0):
+            distancias, _ = dijkstra(self.ARISTAS, 'A')
+        self.assertEqual(distancias, self.ESPERADO)
+    
+    def test_delta_stepping_rechaza_pesos_negativos(self):
+        self.assertEqual(dijkstra_delta_stepping(self.ARISTAS, 'A'), ({}, {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
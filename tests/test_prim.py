@@ -0,0 +1,65 @@
+"""
+Pruebas del algoritmo de Prim.
+
+Se ejecutan con: python -m unittest discover tests
+"""
+
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from src import prim as modulo
+from src.graph_utils import construir_csr_desde_arrays, aristas_a_arrays
+from src.prim import prim
+
+
+def _grafo_aleatorio(n: int, semilla: int):
+    """Grafo conexo: un árbol aleatorio más aristas extra con pesos repetidos."""
+    r = random.Random(semilla)
+    aristas = [(f"N{i}", f"N{r.randrange(i)}", r.randint(1, 50)) for i in range(1, n)]
+    aristas += [(f"N{r.randrange(n)}", f"N{r.randrange(n)}", r.randint(1, 50)) for _ in range(3 * n)]
+    r.shuffle(aristas)
+    return aristas
+
+
+@unittest.skipIf(modulo.reverse_cuthill_mckee is None, "requiere scipy")
+class TestReordenamientoRCM(unittest.TestCase):
+    """Renumerar los nodos con RCM no debe cambiar el peso del MST."""
+    
+    def test_mismo_peso_con_y_sin_rcm(self):
+        aristas = _grafo_aleatorio(500, semilla=1)
+        csr = construir_csr_desde_arrays(*aristas_a_arrays(aristas))
+        mst, peso = modulo._prim_csr(*csr, nodo_inicial='N0')
+        mst_rcm, peso_rcm = modulo._prim_csr(*modulo._reordenar_rcm(*csr), nodo_inicial='N0')
+        self.assertEqual(peso_rcm, peso)
+        self.assertEqual(len(mst_rcm), len(mst))
+    
+    def test_csr_cacheado_reordenado(self):
+        aristas = _grafo_aleatorio(300, semilla=2)
+        with tempfile.TemporaryDirectory() as carpeta:
+            archivo = os.path.join(carpeta, 'grafo.csv')
+            with open(archivo, 'w', encoding='utf-8') as f:
+                f.writelines(f"{a},{b},{w}\n" for a, b, w in aristas)
+            with mock.patch.object(modulo, '_UMBRAL_REORDENAR', 0):
+                id_of, csr = modulo._csr_prim_cacheado(archivo, os.path.getmtime(archivo))
+        _, peso_rcm = modulo._prim_csr(*csr, nodo_inicial=aristas[0][0], id_of=id_of)
+        _, peso = prim(aristas)
+        self.assertEqual(peso_rcm, peso)
+
+
+class TestNodoInicial(unittest.TestCase):
+    """Un nodo inicial inexistente se informa como en el resto de los algoritmos."""
+    
+    def test_nodo_inexistente(self):
+        self.assertEqual(prim([('A', 'B', 1), ('B', 'C', 2)], nodo_inicial='Z'), ([], 0))
+    
+    def test_nodo_existente(self):
+        mst, peso = prim([('A', 'B', 1), ('B', 'C', 2)], nodo_inicial='C')
+        self.assertEqual(peso, 3)
+        self.assertEqual(mst[0], ('C', 'B', 2))
+
+
+if __name__ == "__main__":
+    unittest.main()